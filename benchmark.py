@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    This is free and unencumbered software released into the public domain.
+
+    Anyone is free to copy, modify, publish, use, compile, sell, or
+    distribute this software, either in source code form or as a compiled
+    binary, for any purpose, commercial or non-commercial, and by any
+    means.
+
+    In jurisdictions that recognize copyright laws, the author or authors
+    of this software dedicate any and all copyright interest in the
+    software to the public domain. We make this dedication for the benefit
+    of the public at large and to the detriment of our heirs and
+    successors. We intend this dedication to be an overt act of
+    relinquishment in perpetuity of all present and future rights to this
+    software under copyright law.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+    EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+    MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+    IN NO EVENT SHALL THE AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+    OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+    ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+    OTHER DEALINGS IN THE SOFTWARE.
+
+    For more information, please refer to <http://unlicense.org/>
+
+
+    Original Source: https://github.com/anxdpanic/python-modules/
+
+
+    Startup and hot path benchmarks, using kodi_stub in place of Kodi
+
+    Example:
+        # save a baseline
+        ..$ python3 benchmark.py --save benchmark_baseline.json
+
+        # compare against the baseline, exits with 1 when a benchmark is more than
+        # --tolerance (default: 25%) slower
+        ..$ python3 benchmark.py --compare benchmark_baseline.json
+
+        # simulate 0.5ms per Kodi API call
+        ..$ python3 benchmark.py --latency 0.0005
+
+"""
+
+import argparse
+import json
+import math
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import kodi_stub
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+MODULES = ['logger', 'kodi_gettext', 'kodi_jsonrpc', 'silence', 'shortcuts', 'kssc']
+
+
+class Benchmark:
+
+    def __init__(self, runs=20, latency=0.0):
+        """
+        :param runs: number of measurements per benchmark
+        :type runs: int
+        :param latency: seconds each Kodi API call takes
+        :type latency: float
+        """
+        self.runs = runs
+        self.latency = latency
+        self.results = {}
+
+        kodi_stub.install(latency)
+
+    def measure(self, name, function, iterations=1):
+        """
+        Record the median and p95 seconds per call of function
+        :param name: name of the benchmark
+        :type name: str
+        :param function: callable to measure
+        :type function: callable
+        :param iterations: calls per measurement
+        :type iterations: int
+        """
+        samples = []
+        for _ in range(self.runs):
+            start_time = time.perf_counter()
+            for _ in range(iterations):
+                function()
+            samples.append((time.perf_counter() - start_time) / iterations)
+
+        samples.sort()
+        self.results[name] = {
+            'median': samples[len(samples) // 2],
+            'p95': samples[max(int(math.ceil(0.95 * len(samples))) - 1, 0)],
+            'runs': self.runs,
+            'iterations': iterations,
+        }
+
+    def skip(self, name, reason):
+        self.results[name] = {'skipped': reason}
+
+    def run(self):
+        self.startup()
+        self.translator()
+        self.logger()
+        self.kssc()
+        self.silence()
+        return self.results
+
+    def startup(self):
+        """
+        Interpreter start up and import of each module with kodi_stub installed
+        """
+        code = 'import kodi_stub; kodi_stub.install(%r); import %%s' % self.latency
+        environment = dict(os.environ, PYTHONPATH=ROOT)
+
+        for module in [''] + MODULES:
+            name = 'startup.%s' % (module or 'interpreter')
+            command = [sys.executable, '-c', code % module if module else 'pass']
+
+            if module and subprocess.call(command, env=environment, stdout=subprocess.DEVNULL,
+                                          stderr=subprocess.DEVNULL):
+                self.skip(name, 'import failed')
+                continue
+
+            self.measure(name, lambda: subprocess.check_call(command, env=environment))
+
+    def translator(self):
+        import kodi_gettext
+        import xbmcaddon
+
+        xbmcaddon.strings.update({30000 + index: 'String %d' % index for index in range(1000)})
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'strings.po')
+            with open(filename, 'w', encoding='utf-8') as open_file:
+                open_file.write('msgid ""\nmsgstr ""\n\n')
+                for index in range(1000):
+                    open_file.write('msgctxt "#%d"\nmsgid "String %d"\nmsgstr ""\n\n' %
+                                    (30000 + index, index))
+
+            kodi_translator = kodi_gettext.Translator(addon_id='script.kodi_stub')
+            self.measure('translator.i18n.kodi', lambda: kodi_translator.i18n(30500), 1000)
+
+            self.measure('translator.load.file',
+                         lambda: kodi_gettext.Translator(filename=filename).i18n(30500))
+
+            file_translator = kodi_gettext.Translator(filename=filename)
+            self.measure('translator.i18n.file', lambda: file_translator.i18n(30500), 1000)
+
+    def logger(self):
+        import logger
+
+        levels = ['debug', 'info', 'warning', 'error', 'critical']
+
+        kodi_log = logger.Log(package='benchmark', module='benchmark.py')
+        for level in levels:
+            self.measure('logger.kodi.%s' % level,
+                         lambda: getattr(kodi_log, level)('benchmark message'), 1000)
+
+        xbmc, logger.xbmc = logger.xbmc, None
+        try:
+            python_log = logger.Log(name='benchmark.%d' % os.getpid(), package='benchmark')
+            with open(os.devnull, 'w') as devnull:
+                for handler in python_log._log.handlers:
+                    handler.setStream(devnull)
+
+                for level in levels:
+                    self.measure('logger.python.%s' % level,
+                                 lambda: getattr(python_log, level)('benchmark message'), 1000)
+
+                for handler in list(python_log._log.handlers):
+                    python_log._log.removeHandler(handler)
+        finally:
+            logger.xbmc = xbmc
+
+    def kssc(self, addons=200, settings=50):
+        """
+        kssc scan of a synthetic profile, addons with settings stored settings not in the
+        default settings, and a kodi.log reporting them
+        """
+        try:
+            import kssc
+        except ImportError as error:
+            self.skip('kssc.scan', str(error))
+            self.skip('kssc.log', str(error))
+            return
+
+        directory = tempfile.mkdtemp()
+        try:
+            log_lines = []
+            for index in range(addons):
+                addon_id = 'plugin.video.benchmark%d' % index
+                default_ids = ['setting%d' % number for number in range(settings)]
+                stored_ids = default_ids + ['removed%d' % number for number in range(5)]
+
+                for path, ids in [(os.path.join(directory, 'addons', addon_id, 'resources'),
+                                   default_ids),
+                                  (os.path.join(directory, 'userdata', 'addon_data', addon_id),
+                                   stored_ids)]:
+                    os.makedirs(path)
+                    with open(os.path.join(path, 'settings.xml'), 'w') as open_file:
+                        open_file.write('<settings>%s</settings>' %
+                                        ''.join('<setting id="%s" />' % setting_id
+                                                for setting_id in ids))
+
+                log_lines.extend('2021-01-01 12:00:00.000 T:1    DEBUG <CAddonSettings[%s]>: '
+                                 'failed to find definition for setting removed%d. '
+                                 'Creating a setting on-the-fly...\n' % (addon_id, number)
+                                 for number in range(5))
+                log_lines.extend('2021-01-01 12:00:00.000 T:1    DEBUG <general>: filler\n'
+                                 for _ in range(100))
+
+            os.makedirs(os.path.join(directory, 'temp'))
+            with open(os.path.join(directory, 'temp', 'kodi.log'), 'w') as open_file:
+                open_file.writelines(log_lines)
+
+            def scan():
+                paths = kssc.Paths(directory)
+                for _, stored_xml, default_xml in paths.required:
+                    _ = kssc.SettingsXML(default_xml) == kssc.SettingsXML(stored_xml)
+
+            self.measure('kssc.scan', scan)
+            self.measure('kssc.log', lambda: kssc.KodiLog(kssc.Paths(directory).logs).missing)
+        finally:
+            shutil.rmtree(directory)
+
+    def silence(self):
+        import kodi_jsonrpc
+        import silence
+
+        kodi_stub.reset()
+        client = kodi_jsonrpc.Client()
+
+        def toggle():
+            saved_volume = silence.toggle(client, None)
+            silence.toggle(client, saved_volume)
+
+        self.measure('silence.toggle', toggle, 100)
+
+
+def compare(results, baseline, tolerance):
+    """
+    :return: names of the benchmarks slower than baseline by more than tolerance
+    :rtype: list
+    """
+    regressions = []
+    for name, result in sorted(results.items()):
+        previous = baseline.get(name, {})
+        if 'median' not in result or 'median' not in previous:
+            continue
+
+        change = (result['median'] - previous['median']) / previous['median']
+        marker = ''
+        if change > tolerance:
+            regressions.append(name)
+            marker = ' REGRESSION'
+
+        print('%-32s %12.3fus %12.3fus %+8.1f%%%s' %
+              (name, previous['median'] * 1e6, result['median'] * 1e6, change * 100, marker))
+
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmarks')
+    parser.add_argument('--runs', type=int, default=20, help='measurements per benchmark')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='seconds each simulated Kodi API call takes')
+    parser.add_argument('--save', metavar='FILENAME', default=None,
+                        help='write the results to a JSON baseline')
+    parser.add_argument('--compare', metavar='FILENAME', default=None,
+                        help='compare the results with a JSON baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='allowed slow down when comparing, 0.25 = 25%%')
+    arguments = parser.parse_args()
+
+    sys.path.insert(0, ROOT)
+    benchmark_results = Benchmark(runs=arguments.runs, latency=arguments.latency).run()
+
+    if arguments.save:
+        with open(arguments.save, 'w', encoding='utf-8') as open_file:
+            json.dump(benchmark_results, open_file, indent=4, sort_keys=True)
+
+    if not arguments.compare:
+        for benchmark_name, benchmark_result in sorted(benchmark_results.items()):
+            if 'median' in benchmark_result:
+                print('%-32s %12.3fus  p95 %12.3fus' % (benchmark_name,
+                                                        benchmark_result['median'] * 1e6,
+                                                        benchmark_result['p95'] * 1e6))
+            else:
+                print('%-32s skipped, %s' % (benchmark_name, benchmark_result['skipped']))
+        exit(0)
+
+    with open(arguments.compare, encoding='utf-8') as open_file:
+        baseline_results = json.load(open_file)
+
+    exit(1 if compare(benchmark_results, baseline_results, arguments.tolerance) else 0)
@@ -30,13 +30,25 @@
 
     Original Source: https://github.com/anxdpanic/python-modules/
 
+
+    Example:
+        # sync a catalog with the en_gb source catalog
+        merge('resource.language.en_gb/strings.po', 'resource.language.nl_nl/strings.po')
+
+        # sync every catalog in resources/language/ using a process pool
+        merge_tree('resources/language/')
+
 """
 
+import os
+
 try:
     import xbmcaddon
 except ImportError:
     xbmcaddon = None
 
+SOURCE_LANGUAGE = 'resource.language.en_gb'
+
 
 class Translator:
 
@@ -141,6 +153,10 @@ class POEntry:
         self._msgid = None
         self._msgstr = None
 
+        self.comments = []
+        self.flags = []
+        self.previous_msgid = None  # msgid the fuzzy translation was made for
+
     @property
     def msgctxt(self):
         try:
@@ -171,6 +187,17 @@ class POEntry:
     def msgstr(self, value):
         self._msgstr = value
 
+    @property
+    def fuzzy(self):
+        return 'fuzzy' in self.flags
+
+    @fuzzy.setter
+    def fuzzy(self, value):
+        if value and not self.fuzzy:
+            self.flags.append('fuzzy')
+        elif not value and self.fuzzy:
+            self.flags.remove('fuzzy')
+
     def valid(self):
         return isinstance(self.msgctxt, int) and \
                isinstance(self.msgid, str) and \
@@ -178,7 +205,242 @@ class POEntry:
 
     def __str__(self):
         if self.valid():
-            return 'msgctxt "#%d"\nmsgid "%s"\nmsgstr "%s"\n\n' % \
-                   (self.msgctxt, self.msgid, self.msgstr)
+            leaders = ''.join('%s\n' % comment for comment in self.comments)
+            if self.flags:
+                leaders += '#, %s\n' % ', '.join(self.flags)
+            if self.previous_msgid is not None:
+                leaders += '#| msgid "%s"\n' % self.previous_msgid
+
+            return '%smsgctxt "#%d"\nmsgid "%s"\nmsgstr "%s"\n\n' % \
+                   (leaders, self.msgctxt, self.msgid, self.msgstr)
 
         return ''
+
+
+class POCatalog:
+
+    def __init__(self, filename):
+        """
+        Streaming reader for Kodi gettext files, entries are read one at a time
+        :param filename: filename and path to po file to read
+        :type filename: str
+        """
+        self.filename = filename
+        self.header = ''
+
+    def __iter__(self):
+        """
+        Iterate the POEntry()'s of the catalog in file order, self.header is populated
+        with the header (msgid "") block once it has been read
+        :raises ValueError: when entries are not in ascending msgctxt order
+        """
+        previous_msgctxt = None
+
+        with open(self.filename, encoding='utf-8') as open_file:
+            for block in self._blocks(open_file):
+                entry = self._entry(block)
+
+                if entry is None:
+                    if not self.header and any(line.startswith('msgid ""') for line in block):
+                        self.header = ''.join('%s\n' % line for line in block) + '\n'
+                    continue
+
+                if previous_msgctxt is not None and entry.msgctxt <= previous_msgctxt:
+                    raise ValueError('%s: msgctxt "#%d" is not in ascending order' %
+                                     (self.filename, entry.msgctxt))
+
+                previous_msgctxt = entry.msgctxt
+                yield entry
+
+    @staticmethod
+    def _blocks(lines):
+        """
+        Group lines into blank line separated blocks
+        """
+        block = []
+        for line in lines:
+            line = line.rstrip('\r\n')
+            if line.strip():
+                block.append(line)
+            elif block:
+                yield block
+                block = []
+
+        if block:
+            yield block
+
+    @staticmethod
+    def _entry(block):
+        """
+        :return: POEntry() for block, None if block isn't a valid Kodi entry
+        :rtype: POEntry, None
+        """
+        entry = POEntry()
+        values = {}
+        keyword = None
+        previous_keyword = None
+
+        for line in block:
+            if line.startswith('#,'):
+                entry.flags.extend(flag.strip() for flag in line[2:].split(',') if flag.strip())
+            elif line.startswith('#|'):
+                previous_line = line[2:].strip()
+                if previous_line.startswith('"') and previous_keyword == 'msgid':
+                    entry.previous_msgid += previous_line[1:-1]
+                else:
+                    previous_keyword, _, value = previous_line.partition(' ')
+                    if previous_keyword == 'msgid':
+                        entry.previous_msgid = value.strip()[1:-1]
+            elif line.startswith('#'):
+                entry.comments.append(line)
+            elif line.startswith('"') and keyword:
+                values[keyword] += line.strip()[1:-1]
+            else:
+                keyword, _, value = line.partition(' ')
+                values[keyword] = value.strip()[1:-1]
+
+        msgctxt = values.get('msgctxt', '')
+        if not msgctxt.startswith('#') or not msgctxt[1:].isdigit():
+            return None
+
+        entry.msgctxt = msgctxt[1:]
+        entry.msgid = values.get('msgid')
+        entry.msgstr = values.get('msgstr')
+
+        return entry if entry.valid() else None
+
+
+def merge(source_filename, target_filename, output_filename=None):
+    """
+    Sync a catalog with its source catalog, both are read and written one entry at a time;
+        - entries only in the source are added untranslated
+        - entries with a changed msgid keep their translation and are marked fuzzy,
+          with the msgid the translation was made for as the previous msgid (#|)
+        - translator comments (# ) are kept, extracted comments and references (#. #:)
+          are taken from the source
+        - entries no longer in the source are removed
+    The output is written to a temporary file and atomically replaces output_filename
+    :param source_filename: filename and path to the source (en_gb) po file
+    :type source_filename: str
+    :param target_filename: filename and path to the translated po file, may not exist
+    :type target_filename: str
+    :param output_filename: filename and path to write to, defaults to target_filename
+    :type output_filename: str, None
+    :return: number of entries added, fuzzy, removed and unchanged
+    :rtype: dict
+    """
+    # imported here, Translator doesn't need them
+    import shutil
+    import tempfile
+
+    output_filename = output_filename or target_filename
+    counts = {'added': 0, 'fuzzy': 0, 'removed': 0, 'unchanged': 0}
+
+    source = POCatalog(source_filename)
+    target = POCatalog(target_filename)
+
+    source_entries = iter(source)
+    target_entries = iter(target) if os.path.exists(target_filename) else iter(())
+
+    file_descriptor, temporary_filename = \
+        tempfile.mkstemp(prefix='.', suffix='.po', dir=os.path.dirname(output_filename) or '.')
+    try:
+        with open(file_descriptor, 'w', encoding='utf-8', newline='\n') as open_file:
+            source_entry = next(source_entries, None)
+            target_entry = next(target_entries, None)
+
+            open_file.write(target.header or source.header)
+
+            while source_entry is not None:
+                if target_entry is not None and target_entry.msgctxt < source_entry.msgctxt:
+                    counts['removed'] += 1
+                    target_entry = next(target_entries, None)
+                    continue
+
+                entry = POEntry()
+                entry.comments = [comment for comment in source_entry.comments
+                                  if comment.startswith(('#.', '#:'))]
+                entry.msgctxt = source_entry.msgctxt
+                entry.msgid = source_entry.msgid
+                entry.msgstr = ''
+
+                if target_entry is None or target_entry.msgctxt > source_entry.msgctxt:
+                    counts['added'] += 1
+
+                else:
+                    entry.comments = [comment for comment in target_entry.comments
+                                      if not comment.startswith(('#.', '#:'))] + \
+                        entry.comments
+                    entry.msgstr = target_entry.msgstr
+                    entry.flags = [flag for flag in target_entry.flags if flag != 'fuzzy']
+
+                    changed = target_entry.msgid != source_entry.msgid
+                    entry.fuzzy = bool(entry.msgstr) and (changed or target_entry.fuzzy)
+                    if entry.fuzzy:
+                        # keep the msgid an earlier fuzzy translation was made for
+                        previous_msgid = target_entry.previous_msgid \
+                            if target_entry.fuzzy else None
+                        if previous_msgid is None and changed:
+                            previous_msgid = target_entry.msgid
+                        if previous_msgid != entry.msgid:
+                            entry.previous_msgid = previous_msgid
+                    counts['fuzzy' if changed and entry.msgstr else 'unchanged'] += 1
+
+                    target_entry = next(target_entries, None)
+
+                open_file.write(str(entry))
+                source_entry = next(source_entries, None)
+
+            while target_entry is not None:
+                counts['removed'] += 1
+                target_entry = next(target_entries, None)
+
+        if os.path.exists(output_filename):
+            shutil.copymode(output_filename, temporary_filename)
+        else:
+            os.chmod(temporary_filename, 0o644)
+
+        os.replace(temporary_filename, output_filename)
+
+    except BaseException:
+        if os.path.exists(temporary_filename):
+            os.remove(temporary_filename)
+        raise
+
+    return counts
+
+
+def merge_tree(language_directory, source_language=SOURCE_LANGUAGE, processes=None):
+    """
+    Sync every catalog in language_directory with the source language catalog
+    :param language_directory: path to resources/language/
+    :type language_directory: str
+    :param source_language: directory name of the source language
+    :type source_language: str
+    :param processes: number of worker processes, defaults to the number of CPUs
+    :type processes: int, None
+    :return: {filename: counts from merge(), or the error message}
+    :rtype: dict
+    """
+    # imported here, Translator doesn't need them
+    import glob
+    from concurrent.futures import ProcessPoolExecutor
+
+    source_filename = os.path.join(language_directory, source_language, 'strings.po')
+    target_filenames = sorted(filename for filename in
+                              glob.glob(os.path.join(language_directory, '*', 'strings.po'))
+                              if os.path.dirname(filename) !=
+                              os.path.dirname(source_filename))
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = {filename: pool.submit(merge, source_filename, filename)
+                   for filename in target_filenames}
+
+        for filename, future in futures.items():
+            try:
+                results[filename] = future.result()
+            except (OSError, ValueError) as error:
+                results[filename] = str(error)
+
+    return results
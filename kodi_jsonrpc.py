@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    This is free and unencumbered software released into the public domain.
+
+    Anyone is free to copy, modify, publish, use, compile, sell, or
+    distribute this software, either in source code form or as a compiled
+    binary, for any purpose, commercial or non-commercial, and by any
+    means.
+
+    In jurisdictions that recognize copyright laws, the author or authors
+    of this software dedicate any and all copyright interest in the
+    software to the public domain. We make this dedication for the benefit
+    of the public at large and to the detriment of our heirs and
+    successors. We intend this dedication to be an overt act of
+    relinquishment in perpetuity of all present and future rights to this
+    software under copyright law.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+    EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+    MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+    IN NO EVENT SHALL THE AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+    OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+    ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+    OTHER DEALINGS IN THE SOFTWARE.
+
+    For more information, please refer to <http://unlicense.org/>
+
+
+    Original Source: https://github.com/anxdpanic/python-modules/
+
+
+    Example:
+        client = Client()
+
+        # one round trip
+        volume = client.call('Application.GetProperties', {'properties': ['volume']})
+
+        # requests that don't change can be serialized once and reused
+        GET_VOLUME = Request('Application.GetProperties', {'properties': ['volume']})
+        MUTE = Request('Application.SetMute', {'mute': True})
+
+        # both requests in a single round trip, responses are in the order of the requests
+        volume, mute = client.batch([GET_VOLUME, MUTE])
+
+
+    Remote clients (TCP/HTTP, asyncio) are available in kodi_jsonrpc_remote.py
+
+"""
+
+import json
+
+try:
+    import xbmc
+except ImportError:
+    xbmc = None
+
+
+class Request:
+
+    def __init__(self, method, params=None):
+        """
+        A JSON-RPC request serialized once, only the id is added on use
+        :param method: JSON-RPC method, ie. Application.SetVolume
+        :type method: str
+        :param params: JSON-RPC params
+        :type params: dict, None
+        """
+        self.method = method
+        self._template = '{"jsonrpc": "2.0", "method": %s, "params": %s, "id": %%d}' % \
+                         (json.dumps(method), json.dumps(params or {}).replace('%', '%%'))
+
+    def serialize(self, request_id):
+        """
+        :param request_id: JSON-RPC request id
+        :type request_id: int
+        :return: serialized request
+        :rtype: str
+        """
+        return self._template % request_id
+
+
+class Client:
+
+    def __init__(self, transport=None):
+        """
+        Kodi JSON-RPC client
+        :param transport: callable sending a serialized request and returning the serialized
+                          response, defaults to xbmc.executeJSONRPC
+        :type transport: callable, None
+        """
+        if transport is None:
+            if xbmc is None:
+                raise ValueError('`transport` is required when xbmc is unavailable.')
+
+            transport = xbmc.executeJSONRPC
+
+        self._transport = transport
+        self._request_id = 0
+
+    def call(self, request, params=None):
+        """
+        Execute a single request
+        :param request: Request() or JSON-RPC method
+        :type request: Request, str
+        :param params: JSON-RPC params when request is a method
+        :type params: dict, None
+        :return: JSON-RPC response
+        :rtype: dict
+        """
+        request = self._request(request, params)
+        return json.loads(self._transport(request.serialize(self._next_id())))
+
+    def batch(self, requests):
+        """
+        Execute multiple requests in a single round trip
+        :param requests: list of Request() or (method, params)
+        :type requests: list
+        :return: JSON-RPC responses in the order of requests
+        :rtype: list
+        """
+        requests = [self._request(*request) if isinstance(request, tuple)
+                    else self._request(request) for request in requests]
+        request_ids = [self._next_id() for _ in requests]
+
+        payload = '[%s]' % ', '.join(request.serialize(request_id)
+                                     for request, request_id in zip(requests, request_ids))
+
+        return self.match(request_ids, json.loads(self._transport(payload)))
+
+    @staticmethod
+    def match(request_ids, response):
+        """
+        Match batch responses to their request ids
+        :param request_ids: ids of the batched requests
+        :type request_ids: list
+        :param response: deserialized batch response
+        :type response: list, dict
+        :return: responses in the order of request_ids
+        :rtype: list
+        """
+        if not isinstance(response, list):
+            # the batch was rejected as a whole, ie. invalid request
+            return [response for _ in request_ids]
+
+        responses = {element.get('id'): element for element in response
+                     if isinstance(element, dict)}
+
+        missing = {'jsonrpc': '2.0', 'error': {'code': -32603, 'message': 'Missing response'}}
+        return [responses.get(request_id, missing) for request_id in request_ids]
+
+    @staticmethod
+    def _request(request, params=None):
+        if isinstance(request, Request):
+            return request
+
+        return Request(request, params)
+
+    def _next_id(self):
+        self._request_id += 1
+        return self._request_id
@@ -0,0 +1,449 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    This is free and unencumbered software released into the public domain.
+
+    Anyone is free to copy, modify, publish, use, compile, sell, or
+    distribute this software, either in source code form or as a compiled
+    binary, for any purpose, commercial or non-commercial, and by any
+    means.
+
+    In jurisdictions that recognize copyright laws, the author or authors
+    of this software dedicate any and all copyright interest in the
+    software to the public domain. We make this dedication for the benefit
+    of the public at large and to the detriment of our heirs and
+    successors. We intend this dedication to be an overt act of
+    relinquishment in perpetuity of all present and future rights to this
+    software under copyright law.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+    EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+    MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+    IN NO EVENT SHALL THE AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+    OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+    ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+    OTHER DEALINGS IN THE SOFTWARE.
+
+    For more information, please refer to <http://unlicense.org/>
+
+
+    Original Source: https://github.com/anxdpanic/python-modules/
+
+
+    Remote Kodi JSON-RPC clients, kept separate from kodi_jsonrpc.py so scripts running
+    inside Kodi don't pay for importing asyncio
+
+    Example:
+        # Kodi's TCP JSON-RPC socket (port 9090) with a fallback to HTTP (port 8080)
+        async def toggle_mute(hosts):
+            pool = Pool(username='kodi', password='kodi')
+            try:
+                clients = await asyncio.gather(*(pool.client(host) for host in hosts))
+                return await asyncio.gather(*(client.call('Application.SetMute',
+                                                          {'mute': 'toggle'})
+                                              for client in clients))
+            finally:
+                await pool.close()
+
+        asyncio.run(toggle_mute(['kodi-1', 'kodi-2']))
+
+"""
+
+import asyncio
+import base64
+import codecs
+import json
+
+from kodi_jsonrpc import Client
+
+
+class ClosedConnectionError(ConnectionError):
+    """
+    The connection was closed before any of the response was received
+    """
+
+
+class TCPConnection:
+
+    def __init__(self, host, port=9090, timeout=10):
+        """
+        Persistent connection to Kodi's raw TCP JSON-RPC socket, requests are pipelined and
+        responses are matched to their requests by id. A dropped connection, ie. Kodi
+        restarted, is reopened on the next request
+        :param host: Kodi host
+        :type host: str
+        :param port: Kodi JSON-RPC TCP port
+        :type port: int
+        :param timeout: seconds to wait for a connection or response
+        :type timeout: float
+        """
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.notification_callbacks = []
+
+        self._reader = None
+        self._writer = None
+        self._read_task = None
+        self._pending = {}
+        self._closed = True
+        self._reopening = None
+
+    async def open(self):
+        self._reader, self._writer = \
+            await asyncio.wait_for(asyncio.open_connection(self.host, self.port), self.timeout)
+        self._read_task = asyncio.ensure_future(self._read())
+        self._closed = False
+
+    async def close(self):
+        self._closed = True
+
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+        if self._read_task is not None:
+            self._read_task.cancel()
+            try:
+                await self._read_task
+            except (asyncio.CancelledError, ConnectionError):
+                pass
+            self._read_task = None
+
+    async def send(self, payload, request_ids, batch=False):
+        """
+        :param payload: serialized request or batch
+        :type payload: str
+        :param request_ids: ids of the requests in payload
+        :type request_ids: list
+        :param batch: payload is a batch
+        :type batch: bool
+        :return: response, or a list of responses for a batch
+        :rtype: dict, list
+        """
+        if self._closed:
+            raise ConnectionError('Connection to %s:%d is closed' % (self.host, self.port))
+
+        if self._writer is None:
+            await self._reopen()
+
+        loop = asyncio.get_running_loop()
+        futures = [loop.create_future() for _ in request_ids]
+        self._pending.update(zip(request_ids, futures))
+
+        try:
+            self._writer.write(payload.encode('utf-8'))
+            await self._writer.drain()
+
+            responses = await asyncio.wait_for(asyncio.gather(*futures), self.timeout)
+        finally:
+            for request_id in request_ids:
+                self._pending.pop(request_id, None)
+
+        return responses if batch else responses[0]
+
+    async def _read(self):
+        decoder = json.JSONDecoder()
+        text_decoder = codecs.getincrementaldecoder('utf-8')()
+        buffer = ''
+
+        try:
+            while True:
+                chunk = await self._reader.read(65536)
+                if not chunk:
+                    break
+
+                buffer += text_decoder.decode(chunk)
+                while True:
+                    buffer = buffer.lstrip()
+                    if not buffer:
+                        break
+
+                    try:
+                        payload, end = decoder.raw_decode(buffer)
+                    except ValueError:
+                        break  # incomplete, wait for more data
+
+                    buffer = buffer[end:]
+                    self._dispatch(payload)
+        finally:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError('Connection to %s:%d was closed' %
+                                                         (self.host, self.port)))
+
+    async def _reopen(self):
+        if self._reopening is None:
+            self._reopening = asyncio.Lock()
+
+        async with self._reopening:
+            if self._writer is None:  # not reopened by a concurrent request
+                await self.close()
+                self._closed = False  # still in use, retry on the next request if this fails
+                await self.open()
+
+    def _dispatch(self, payload):
+        for element in payload if isinstance(payload, list) else [payload]:
+            if not isinstance(element, dict):
+                continue
+
+            future = self._pending.get(element.get('id'))
+            if future is not None:
+                if not future.done():
+                    future.set_result(element)
+
+            elif 'method' in element and 'id' not in element:
+                for callback in self.notification_callbacks:
+                    callback(element.get('method'), element.get('params', {}))
+
+
+class HTTPConnection:
+
+    def __init__(self, host, port=8080, username=None, password=None, timeout=10, size=4):
+        """
+        Pool of persistent (keep-alive) HTTP connections to Kodi's JSON-RPC web server,
+        one request per connection at a time
+        :param host: Kodi host
+        :type host: str
+        :param port: Kodi web server port
+        :type port: int
+        :param username: Kodi web server username
+        :type username: str, None
+        :param password: Kodi web server password
+        :type password: str, None
+        :param timeout: seconds to wait for a connection or response
+        :type timeout: float
+        :param size: maximum number of connections
+        :type size: int
+        """
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.size = size
+        self.notification_callbacks = []  # notifications are unavailable over HTTP
+
+        self._authorization = None
+        if username:
+            credentials = ('%s:%s' % (username, password or '')).encode('utf-8')
+            self._authorization = 'Basic ' + base64.b64encode(credentials).decode('ascii')
+
+        self._idle = []
+        self._opened = 0
+        self._available = None
+
+    async def open(self):
+        self._available = asyncio.Semaphore(self.size)
+
+    async def close(self):
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+        self._opened = 0
+
+    async def send(self, payload, request_ids, batch=False):
+        """
+        :param payload: serialized request or batch
+        :type payload: str
+        :param request_ids: ids of the requests in payload
+        :type request_ids: list
+        :param batch: payload is a batch
+        :type batch: bool
+        :return: response, or a list of responses for a batch
+        :rtype: dict, list
+        """
+        if self._available is None:
+            await self.open()
+
+        async with self._available:
+            reused = bool(self._idle)
+            while True:
+                if reused:
+                    reader, writer = self._idle.pop()
+                else:
+                    reader, writer = await asyncio.wait_for(
+                        asyncio.open_connection(self.host, self.port), self.timeout
+                    )
+
+                try:
+                    body = await asyncio.wait_for(self._post(reader, writer, payload),
+                                                  self.timeout)
+                except ClosedConnectionError:
+                    writer.close()
+                    if not reused:
+                        raise
+                    # the idle connection was closed by Kodi, retry once on a new connection
+                    reused = False
+                    continue
+                except BaseException:
+                    writer.close()
+                    raise
+
+                break
+
+            self._idle.append((reader, writer))
+
+        return json.loads(body)
+
+    async def _post(self, reader, writer, payload):
+        payload = payload.encode('utf-8')
+        headers = [
+            'POST /jsonrpc HTTP/1.1',
+            'Host: %s:%d' % (self.host, self.port),
+            'Content-Type: application/json',
+            'Content-Length: %d' % len(payload),
+            'Connection: keep-alive',
+        ]
+        if self._authorization:
+            headers.append('Authorization: ' + self._authorization)
+
+        try:
+            writer.write(('\r\n'.join(headers) + '\r\n\r\n').encode('ascii') + payload)
+            await writer.drain()
+
+            status_line = await reader.readline()
+        except (BrokenPipeError, ConnectionResetError):
+            status_line = b''
+
+        if not status_line:
+            raise ClosedConnectionError('Connection to %s:%d was closed' %
+                                        (self.host, self.port))
+
+        response_headers = {}
+        while True:
+            line = (await reader.readline()).decode('latin-1').strip()
+            if not line:
+                break
+            key, _, value = line.partition(':')
+            response_headers[key.strip().lower()] = value.strip()
+
+        status = status_line.split(None, 2)
+        if len(status) < 2 or status[1] != b'200':
+            raise ConnectionError('%s:%d responded with %s' %
+                                  (self.host, self.port, status_line.decode('latin-1').strip()))
+
+        if response_headers.get('transfer-encoding', '').lower() == 'chunked':
+            body = b''
+            while True:
+                size = int((await reader.readline()).split(b';')[0], 16)
+                if not size:
+                    await reader.readline()
+                    break
+                body += await reader.readexactly(size)
+                await reader.readline()
+            return body
+
+        return await reader.readexactly(int(response_headers.get('content-length', 0)))
+
+
+class AsyncClient:
+
+    def __init__(self, connection):
+        """
+        Kodi JSON-RPC client for remote connections
+        :param connection: TCPConnection() or HTTPConnection()
+        :type connection: TCPConnection, HTTPConnection
+        """
+        self.connection = connection
+        self._request_id = 0
+
+    async def call(self, request, params=None):
+        """
+        Execute a single request
+        :param request: Request() or JSON-RPC method
+        :type request: Request, str
+        :param params: JSON-RPC params when request is a method
+        :type params: dict, None
+        :return: JSON-RPC response
+        :rtype: dict
+        """
+        request = Client._request(request, params)
+        request_id = self._next_id()
+        return await self.connection.send(request.serialize(request_id), [request_id])
+
+    async def batch(self, requests):
+        """
+        Execute multiple requests in a single round trip
+        :param requests: list of Request() or (method, params)
+        :type requests: list
+        :return: JSON-RPC responses in the order of requests
+        :rtype: list
+        """
+        requests = [Client._request(*request) if isinstance(request, tuple)
+                    else Client._request(request) for request in requests]
+        request_ids = [self._next_id() for _ in requests]
+
+        payload = '[%s]' % ', '.join(request.serialize(request_id)
+                                     for request, request_id in zip(requests, request_ids))
+
+        return Client.match(request_ids,
+                            await self.connection.send(payload, request_ids, batch=True))
+
+    def subscribe(self, callback):
+        """
+        :param callback: called with (method, params) for each notification, TCP only
+        :type callback: callable
+        """
+        self.connection.notification_callbacks.append(callback)
+
+    async def close(self):
+        await self.connection.close()
+
+    def _next_id(self):
+        self._request_id += 1
+        return self._request_id
+
+
+async def connect(host, tcp_port=9090, http_port=8080, username=None, password=None,
+                  timeout=10):
+    """
+    Connect to Kodi's TCP JSON-RPC socket, falling back to HTTP if it's unavailable
+    :return: connected client
+    :rtype: AsyncClient
+    """
+    connection = TCPConnection(host, tcp_port, timeout=timeout)
+    try:
+        await connection.open()
+    except (OSError, asyncio.TimeoutError):
+        connection = HTTPConnection(host, http_port, username=username, password=password,
+                                    timeout=timeout)
+        await connection.open()
+
+    return AsyncClient(connection)
+
+
+class Pool:
+
+    def __init__(self, **kwargs):
+        """
+        Persistent clients to multiple Kodi instances, one per host
+        :param kwargs: keyword arguments for connect()
+        """
+        self.kwargs = kwargs
+        self._clients = {}
+
+    async def client(self, host):
+        """
+        :param host: Kodi host
+        :type host: str
+        :return: connected client, reused on subsequent calls
+        :rtype: AsyncClient
+        """
+        if host not in self._clients:
+            self._clients[host] = asyncio.ensure_future(connect(host, **self.kwargs))
+
+        try:
+            return await asyncio.shield(self._clients[host])
+        except BaseException:
+            self._clients.pop(host, None)
+            raise
+
+    async def close(self):
+        clients, self._clients = self._clients, {}
+        for future in clients.values():
+            if future.done() and not future.cancelled() and future.exception() is None:
+                await future.result().close()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    This is free and unencumbered software released into the public domain.
+
+    Anyone is free to copy, modify, publish, use, compile, sell, or
+    distribute this software, either in source code form or as a compiled
+    binary, for any purpose, commercial or non-commercial, and by any
+    means.
+
+    In jurisdictions that recognize copyright laws, the author or authors
+    of this software dedicate any and all copyright interest in the
+    software to the public domain. We make this dedication for the benefit
+    of the public at large and to the detriment of our heirs and
+    successors. We intend this dedication to be an overt act of
+    relinquishment in perpetuity of all present and future rights to this
+    software under copyright law.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+    EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+    MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+    IN NO EVENT SHALL THE AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+    OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+    ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+    OTHER DEALINGS IN THE SOFTWARE.
+
+    For more information, please refer to <http://unlicense.org/>
+
+
+    Original Source: https://github.com/anxdpanic/python-modules/
+
+
+    Offline stand-in for the Kodi python modules (xbmc, xbmcaddon, xbmcgui), to run and
+    measure the modules in this repository without Kodi. Every Kodi API call sleeps for
+    `latency` seconds to simulate the cost of calling into Kodi.
+
+    Example:
+        import kodi_stub
+        kodi_stub.install(call_latency=0.0005)
+
+        import xbmc  # kodi_stub.xbmc
+
+"""
+
+import sys
+import time
+
+latency = 0.0
+
+
+def install(call_latency=None):
+    """
+    Make the stub modules importable as xbmc, xbmcaddon and xbmcgui
+    :param call_latency: seconds each Kodi API call takes
+    :type call_latency: float, None
+    """
+    global latency
+
+    if call_latency is not None:
+        latency = float(call_latency)
+
+    from kodi_stub import xbmc
+    from kodi_stub import xbmcaddon
+    from kodi_stub import xbmcgui
+
+    sys.modules['xbmc'] = xbmc
+    sys.modules['xbmcaddon'] = xbmcaddon
+    sys.modules['xbmcgui'] = xbmcgui
+
+
+def reset():
+    """
+    Reset the state of the stub modules
+    """
+    from kodi_stub import xbmc
+    from kodi_stub import xbmcaddon
+    from kodi_stub import xbmcgui
+
+    xbmc.reset()
+    xbmcaddon.reset()
+    xbmcgui.reset()
+
+
+def simulate():
+    if latency:
+        time.sleep(latency)
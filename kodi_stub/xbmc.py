@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    This is free and unencumbered software released into the public domain.
+
+    Anyone is free to copy, modify, publish, use, compile, sell, or
+    distribute this software, either in source code form or as a compiled
+    binary, for any purpose, commercial or non-commercial, and by any
+    means.
+
+    In jurisdictions that recognize copyright laws, the author or authors
+    of this software dedicate any and all copyright interest in the
+    software to the public domain. We make this dedication for the benefit
+    of the public at large and to the detriment of our heirs and
+    successors. We intend this dedication to be an overt act of
+    relinquishment in perpetuity of all present and future rights to this
+    software under copyright law.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+    EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+    MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+    IN NO EVENT SHALL THE AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+    OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+    ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+    OTHER DEALINGS IN THE SOFTWARE.
+
+    For more information, please refer to <http://unlicense.org/>
+
+
+    Original Source: https://github.com/anxdpanic/python-modules/
+
+
+    Stand-in for Kodi's xbmc module, see kodi_stub/__init__.py
+
+"""
+
+import collections
+import json
+
+import kodi_stub
+
+LOGDEBUG = 0
+LOGINFO = 1
+LOGWARNING = 2
+LOGERROR = 3
+LOGFATAL = 4
+LOGNONE = 5
+
+log_lines = collections.deque(maxlen=1000)
+application = {'volume': 75, 'muted': False}
+monitors = []
+
+
+def reset():
+    log_lines.clear()
+    application.update({'volume': 75, 'muted': False})
+    del monitors[:]
+
+
+def log(msg, level=LOGDEBUG):
+    kodi_stub.simulate()
+    log_lines.append((level, msg))
+
+
+def executeJSONRPC(jsonrpccommand):
+    """
+    Supports Application.GetProperties, Application.SetVolume and Application.SetMute,
+    single requests and batches
+    """
+    kodi_stub.simulate()
+
+    try:
+        payload = json.loads(jsonrpccommand)
+    except ValueError:
+        return json.dumps(_error(None, -32700, 'Parse error.'))
+
+    if isinstance(payload, list):
+        return json.dumps([_execute(request) for request in payload])
+
+    return json.dumps(_execute(payload))
+
+
+def _execute(request):
+    if not isinstance(request, dict):
+        return _error(None, -32600, 'Invalid request.')
+
+    request_id = request.get('id')
+    method = request.get('method')
+    params = request.get('params') or {}
+
+    if method == 'Application.GetProperties':
+        return _result(request_id, {name: application[name]
+                                    for name in params.get('properties', [])
+                                    if name in application})
+
+    if method == 'Application.SetVolume':
+        application['volume'] = max(0, min(100, int(params.get('volume', 0))))
+        _notify()
+        return _result(request_id, application['volume'])
+
+    if method == 'Application.SetMute':
+        mute = params.get('mute')
+        application['muted'] = not application['muted'] if mute == 'toggle' else bool(mute)
+        _notify()
+        return _result(request_id, application['muted'])
+
+    return _error(request_id, -32601, 'Method not found.')
+
+
+def _result(request_id, result):
+    return {'id': request_id, 'jsonrpc': '2.0', 'result': result}
+
+
+def _error(request_id, code, message):
+    return {'id': request_id, 'jsonrpc': '2.0', 'error': {'code': code, 'message': message}}
+
+
+def _notify():
+    data = json.dumps({'volume': float(application['volume']), 'muted': application['muted']})
+    for monitor in list(monitors):
+        monitor.onNotification('xbmc', 'Application.OnVolumeChanged', data)
+
+
+class Monitor:
+
+    def __init__(self):
+        monitors.append(self)
+
+    def abortRequested(self):
+        return True
+
+    def waitForAbort(self, timeout=None):
+        return True
+
+    def onNotification(self, sender, method, data):
+        pass
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    This is free and unencumbered software released into the public domain.
+
+    Anyone is free to copy, modify, publish, use, compile, sell, or
+    distribute this software, either in source code form or as a compiled
+    binary, for any purpose, commercial or non-commercial, and by any
+    means.
+
+    In jurisdictions that recognize copyright laws, the author or authors
+    of this software dedicate any and all copyright interest in the
+    software to the public domain. We make this dedication for the benefit
+    of the public at large and to the detriment of our heirs and
+    successors. We intend this dedication to be an overt act of
+    relinquishment in perpetuity of all present and future rights to this
+    software under copyright law.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+    EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+    MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+    IN NO EVENT SHALL THE AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+    OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+    ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+    OTHER DEALINGS IN THE SOFTWARE.
+
+    For more information, please refer to <http://unlicense.org/>
+
+
+    Original Source: https://github.com/anxdpanic/python-modules/
+
+
+    Stand-in for Kodi's xbmcgui module, see kodi_stub/__init__.py
+
+"""
+
+import kodi_stub
+
+properties = {}
+
+
+def reset():
+    # existing Window()'s keep a reference to their properties
+    for window_properties in properties.values():
+        window_properties.clear()
+
+
+class Window:
+
+    def __init__(self, existingWindowId=-1):
+        kodi_stub.simulate()
+        self._properties = properties.setdefault(existingWindowId, {})
+
+    def getProperty(self, key):
+        kodi_stub.simulate()
+        return self._properties.get(key.lower(), '')
+
+    def setProperty(self, key, value):
+        kodi_stub.simulate()
+        self._properties[key.lower()] = value
+
+    def clearProperty(self, key):
+        kodi_stub.simulate()
+        self._properties.pop(key.lower(), None)
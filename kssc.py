@@ -20,6 +20,9 @@
     backup <filename.timestamp> will be created before changes to any files
     are made.
 
+    If a kodi.log is provided, only the add-ons and settings reported in the
+    log will be checked. The log is read in chunks, so large logs are fine.
+
     Example usage:
         # special://home -> https://kodi.wiki/view/Special_protocol#Default_OS_mappings
 
@@ -29,6 +32,12 @@
         # pass special://home (translated) as an argument
         ..\> python kssc.py D:\Programs\Kodi_19\portable_data
 
+        # only check the settings reported in special://home/temp/kodi.log and kodi.old.log
+        ..\> python kssc.py D:\Programs\Kodi_19\portable_data --log
+
+        # only check the settings reported in the provided log(s)
+        ..\> python kssc.py --log D:\logs\kodi.log D:\logs\kodi.old.log
+
 
     This is free and unencumbered software released into the public domain.
 
@@ -57,9 +66,10 @@
 
 """
 
+import argparse
 import os
+import re
 import shutil
-import sys
 import time
 from lxml import etree
 
@@ -68,18 +78,23 @@ class Paths:
     _required = []
     _working_directory = os.getcwd()
 
-    def __init__(self):
+    def __init__(self, working_directory=None):
+        if working_directory:
+            self._working_directory = working_directory
+
         self.addons = os.path.join(self.working_directory, 'addons')
         self.addon_data = os.path.join(self.working_directory, 'userdata', 'addon_data')
+        self.logs = [os.path.join(self.working_directory, 'temp', 'kodi.log'),
+                     os.path.join(self.working_directory, 'temp', 'kodi.old.log')]
 
     def settings_path(self, _addon_id):
         return os.path.join(self.addons, _addon_id, 'resources', 'settings.xml')
 
+    def stored_settings_path(self, _addon_id):
+        return os.path.join(self.addon_data, _addon_id, 'settings.xml')
+
     @property
     def working_directory(self):
-        if len(sys.argv) == 2:
-            self._working_directory = sys.argv[1]
-
         return self._working_directory
 
     @property
@@ -96,6 +111,19 @@ class Paths:
 
         return self._required
 
+    def targeted(self, addon_ids):
+        """
+        Same as `required`, limited to the provided add-on ids, without walking addon_data
+        :param addon_ids: add-on ids to check
+        :type addon_ids: iterable
+        :return: list of (add-on id, stored settings.xml, default settings.xml)
+        :rtype: list
+        """
+        return [(addon_id, self.stored_settings_path(addon_id), self.settings_path(addon_id))
+                for addon_id in sorted(addon_ids)
+                if self.exists(self.stored_settings_path(addon_id)) and
+                self.exists(self.settings_path(addon_id))]
+
     @staticmethod
     def exists(path):
         return os.path.exists(path)
@@ -151,6 +179,105 @@ class SettingsXML:
         return not any([setting_id for setting_id in other.ids if setting_id not in self.ids])
 
 
+class KodiLog:
+    chunk_size = 1024 * 1024
+
+    # Kodi 18: CAddonSettings[plugin.video.example]: failed to find definition for setting ...
+    # Kodi 19: <CAddonSettings[plugin.video.example]>: failed to find definition for setting ...
+    addon_setting_pattern = re.compile(
+        br'CAddonSettings\[(?P<addon_id>[^\]]+)\]>?: failed to find definition for setting '
+        br'(?P<setting_id>.+?)\. Creating a setting on-the-fly'
+    )
+
+    # Kodi 18: CSettingsManager: requested setting (example_id) was not found.
+    # Kodi 19: <CSettingsManager>: requested setting (example_id) was not found.
+    setting_pattern = re.compile(
+        br'CSettingsManager>?: requested setting \((?P<setting_id>.+?)\) was not found'
+    )
+
+    def __init__(self, filenames):
+        """
+        Stream kodi.log(s) and collect the missing settings they report
+        :param filenames: filenames and paths of the logs to parse, missing files are skipped
+        :type filenames: list
+        """
+        self.filenames = filenames
+        self._parsed = False
+        self._missing = {}
+        self._unattributed = set()
+
+    @property
+    def missing(self):
+        """
+        Missing settings reported with their add-on id
+        :return: {add-on id: set(setting ids)}
+        :rtype: dict
+        """
+        if not self._parsed:
+            self.parse()
+
+        return self._missing
+
+    @property
+    def unattributed(self):
+        """
+        Missing settings reported without an add-on id, `requested setting (x) was not found`
+        :return: set(setting ids)
+        :rtype: set
+        """
+        if not self._parsed:
+            self.parse()
+
+        return self._unattributed
+
+    def parse(self):
+        for filename in self.filenames:
+            if not os.path.isfile(filename):
+                continue
+
+            for line in self.lines(filename):
+                self.parse_line(line)
+
+        self._parsed = True
+        return self._missing
+
+    def parse_line(self, line):
+        if b'CAddonSettings[' in line:
+            match = self.addon_setting_pattern.search(line)
+            if match:
+                addon_id = match.group('addon_id').decode('utf-8', 'replace')
+                setting_id = match.group('setting_id').decode('utf-8', 'replace')
+                self._missing.setdefault(addon_id, set()).add(setting_id)
+
+        elif b'CSettingsManager' in line:
+            match = self.setting_pattern.search(line)
+            if match:
+                self._unattributed.add(match.group('setting_id').decode('utf-8', 'replace'))
+
+    def lines(self, filename):
+        """
+        Read a log in fixed size chunks and yield complete lines
+        :param filename: filename and path of the log
+        :type filename: str
+        :return: lines without line endings
+        :rtype: generator
+        """
+        remainder = b''
+        with open(filename, 'rb') as open_file:
+            while True:
+                chunk = open_file.read(self.chunk_size)
+                if not chunk:
+                    break
+
+                lines = (remainder + chunk).split(b'\n')
+                remainder = lines.pop()
+                for line in lines:
+                    yield line
+
+        if remainder:
+            yield remainder
+
+
 def confirm_removals(addon_id, stored_ids, default_ids):
     potential_ids = [setting_id for setting_id in stored_ids if setting_id not in default_ids]
 
@@ -183,11 +310,15 @@ def yes_no(prompt, default_result=True):
 
 
 if __name__ == '__main__':
-    if len(sys.argv) > 2:
-        print('Too many arguments, only path supported')
-        exit(1)
+    parser = argparse.ArgumentParser(description='Kodi saved settings clean up')
+    parser.add_argument('path', nargs='?', default=None,
+                        help='special://home (translated), defaults to the current directory')
+    parser.add_argument('--log', '-l', nargs='*', default=None,
+                        help='only check settings reported in the provided kodi.log(s), '
+                             'defaults to special://home/temp/kodi.log and kodi.old.log')
+    arguments = parser.parse_args()
 
-    paths = Paths()
+    paths = Paths(arguments.path)
 
     if not paths.exists(paths.addons):
         print('Path does not exist ' + paths.addons)
@@ -197,9 +328,24 @@ if __name__ == '__main__':
         print('Path does not exist ' + paths.addon_data)
         exit(1)
 
+    reported = None
+    if arguments.log is not None:
+        kodi_log = KodiLog(arguments.log or paths.logs)
+        reported = kodi_log.missing
+
+        if kodi_log.unattributed:
+            print('Settings reported without an add-on id... skipped: ' +
+                  ', '.join(sorted(kodi_log.unattributed)))
+
+        if not reported:
+            print('No missing add-on settings found in the log... completed.')
+            exit(0)
+
+    required = paths.required if reported is None else paths.targeted(reported)
+
     updated_addons = []
 
-    for identifier, stored_xml, default_xml in paths.required:
+    for identifier, stored_xml, default_xml in required:
 
         default = SettingsXML(default_xml)
         stored = SettingsXML(stored_xml)
@@ -211,7 +357,12 @@ if __name__ == '__main__':
         else:
             print(identifier + ' requires clean up...')
 
-            settings_to_remove = confirm_removals(identifier, stored.ids, default.ids)
+            stored_ids = stored.ids
+            if reported is not None:
+                stored_ids = [setting_id for setting_id in stored_ids
+                              if setting_id in reported[identifier]]
+
+            settings_to_remove = confirm_removals(identifier, stored_ids, default.ids)
 
             if not settings_to_remove:
                 print(identifier + ' no changes made...')
@@ -32,7 +32,7 @@
 
     Usage:
         - Make a copy of this file with whatever name you'd like
-        - Edit the COMMANDS variable below
+        - Edit the COMMANDS variable below, or add commands to the commands directory
 
 
     Example:
@@ -42,12 +42,14 @@
             'help': 'Help text is helpful',             # - help text
             'commands': [                               # - list of commands(dict) to be executed
                 {
-                    'command': 'sudo mkdir /tmp/test/', # - the command to be executed
-                    'shell': True,                      # - use shell’s own pipeline support
+                    'command': ['sudo', 'mkdir',        # - the command to be executed, a list of
+                                '/tmp/test/'],          #   arguments is executed without a shell
+                    'shell': False,                     # - use shell’s own pipeline support,
+                                                        #   requires a string command
                     'require_success': False            # - require the command to successfully
                 },                                      #   execute
                 {
-                    'command': 'sudo touch /tmp/test/test',
+                    'command': 'ls /tmp/test/ | grep test',
                     'shell': True,
                     'require_success': True
                 },
@@ -57,25 +59,130 @@
         ...
     }
 
+
+    Steps are executed one after another by default. To run steps concurrently,
+    give steps an 'id' and declare the steps they depend on with 'requires';
+    a step with 'requires' starts as soon as the listed steps have finished.
+    Steps depending on a failed step with 'require_success' are skipped.
+
+    Example:
+            'commands': [
+                {
+                    'id': 'hdmi',                       # - (optional) name of the step
+                    'command': 'sudo tvservice -p',
+                    'shell': True,
+                    'require_success': True
+                },
+                {
+                    'id': 'sync',
+                    'command': 'sync',
+                    'shell': True,
+                    'requires': [],                     # - (optional) ids of earlier steps
+                    'require_success': False            #   to wait for, [] runs immediately
+                },
+                {
+                    'command': 'sudo systemctl start mediacenter',
+                    'shell': True,
+                    'requires': ['hdmi', 'sync'],
+                    'require_success': False
+                },
+            ]
+
+
+    Commands directory:
+        Commands are also loaded from the *.json and *.toml (python 3.11+) files in
+        SHORTCUTS_COMMANDS (default: ~/.shortcuts), using the same format as COMMANDS.
+        Valid commands are cached in <directory>/.shortcuts-cache.json until a file changes,
+        when a single command argument is used only that command is resolved and checked.
+
+        ~/.shortcuts/kodi.json:
+        {
+            "restart_kodi": {
+                "arguments": ["--restart", "-r"],
+                "help": "Restart Kodi",
+                "commands": [
+                    {
+                        "command": ["sudo", "systemctl", "restart", "mediacenter"],
+                        "shell": false,
+                        "require_success": false
+                    }
+                ]
+            }
+        }
+
+
+    Daemon:
+        Starting a new interpreter for every shortcut is slow on low powered devices,
+        run a resident daemon that validates COMMANDS once and executes shortcuts sent
+        to it over a unix socket (SHORTCUTS_SOCKET, default: /tmp/shortcuts.sock).
+        The daemon is in shortcuts_daemon.py, send shortcuts with shortcuts_client.py,
+        it only imports what it needs to connect;
+
+        ..$ python3 shortcuts.py --serve
+        ..$ python3 shortcuts_client.py restart_kodi
+
+
+    Statistics:
+        The wall time of every shortcut and step is recorded to a history file
+        (SHORTCUTS_HISTORY, default: ~/.shortcuts_history), to show p50/p95 latencies;
+
+        ..$ python3 shortcuts.py --stats
+
+
+    Multiple devices:
+        Run a shortcut on several devices concurrently, the steps of each target are
+        prefixed with the transport command ({target} is replaced with the target);
+
+        ..$ python3 shortcuts.py --restart --targets osmc@kodi-1 osmc@kodi-2 --jobs 8 --timeout 30
+        ..$ python3 shortcuts.py --hdmi --targets a b \\
+                --transport-command "env TARGET={target} sh -c"
+
+
+    Kodi log:
+        Follow the Kodi log (KODI_LOG, default: /home/osmc/.kodi/temp/kodi.log) across
+        log rotation, only writing the lines matching the filters;
+
+        ..$ python3 shortcuts.py --tail --level warning
+        ..$ python3 shortcuts.py --tail --addon plugin.video.example --match "error|exception"
+
 """
 
-import argparse
+import json
+import os
+import re
+import shlex
 import subprocess
+import sys
+import threading
+import time
 import traceback
 
+COMMANDS_PATH = os.environ.get('SHORTCUTS_COMMANDS',
+                               os.path.join(os.path.expanduser('~'), '.shortcuts'))
+SOCKET_PATH = os.environ.get('SHORTCUTS_SOCKET', '/tmp/shortcuts.sock')
+HISTORY_PATH = os.environ.get('SHORTCUTS_HISTORY',
+                              os.path.join(os.path.expanduser('~'), '.shortcuts_history'))
+
+KODI_LOG = os.environ.get('KODI_LOG', '/home/osmc/.kodi/temp/kodi.log')
+
+TRANSPORTS = {
+    'local': [],
+    'ssh': ['ssh', '-o', 'BatchMode=yes', '{target}'],
+}
+
 COMMANDS = {
     'start_kodi': {
         'arguments': ['--start', '-s'],
         'help': 'Start Kodi',
         'commands': [
             {
-                'command': 'sudo tvservice -p',
-                'shell': True,
+                'command': ['sudo', 'tvservice', '-p'],
+                'shell': False,
                 'require_success': False
             },
             {
-                'command': 'sudo systemctl start mediacenter',
-                'shell': True,
+                'command': ['sudo', 'systemctl', 'start', 'mediacenter'],
+                'shell': False,
                 'require_success': False
             },
         ]
@@ -85,8 +192,8 @@ COMMANDS = {
         'help': 'Stop Kodi',
         'commands': [
             {
-                'command': 'sudo systemctl stop mediacenter',
-                'shell': True,
+                'command': ['sudo', 'systemctl', 'stop', 'mediacenter'],
+                'shell': False,
                 'require_success': False
             },
         ]
@@ -96,24 +203,13 @@ COMMANDS = {
         'help': 'Restart Kodi',
         'commands': [
             {
-                'command': 'sudo tvservice -p',
-                'shell': True,
-                'require_success': False
-            },
-            {
-                'command': 'sudo systemctl restart mediacenter',
-                'shell': True,
+                'command': ['sudo', 'tvservice', '-p'],
+                'shell': False,
                 'require_success': False
             },
-        ]
-    },
-    'tail_kodi': {
-        'arguments': ['--tail', '-l'],
-        'help': 'Tail the Kodi log',
-        'commands': [
             {
-                'command': 'sudo tail -f /home/osmc/.kodi/temp/kodi.log',
-                'shell': True,
+                'command': ['sudo', 'systemctl', 'restart', 'mediacenter'],
+                'shell': False,
                 'require_success': False
             },
         ]
@@ -123,8 +219,8 @@ COMMANDS = {
         'help': 'Power on HDMI with preferred settings',
         'commands': [
             {
-                'command': 'sudo tvservice -p',
-                'shell': True,
+                'command': ['sudo', 'tvservice', '-p'],
+                'shell': False,
                 'require_success': False
             },
         ]
@@ -134,8 +230,8 @@ COMMANDS = {
         'help': 'Reboot the device',
         'commands': [
             {
-                'command': 'sudo reboot now',
-                'shell': True,
+                'command': ['sudo', 'reboot', 'now'],
+                'shell': False,
                 'require_success': False
             },
         ]
@@ -145,9 +241,23 @@ COMMANDS = {
 
 class Executor:
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, output=None, prefix=None, deadline=None, **kwargs):
+        """
+        :param output: callable receiving the output(bytes) of the steps, defaults to the console
+        :type output: callable, None
+        :param prefix: command the steps are passed to as a single argument, ie. ssh <target>
+        :type prefix: list, None
+        :param deadline: time.monotonic() after which steps are killed or not started
+        :type deadline: float, None
+        """
         self.args = args
         self.kwargs = kwargs
+        self.output = output
+        self.prefix = prefix
+        self.deadline = deadline
+        self.timings = []
+        self.errors = []
+        self.timed_out = False
 
     @staticmethod
     def validate_command(command_name, command_descriptor):
@@ -162,61 +272,807 @@ class Executor:
             return False
 
         command_commands = command_descriptor.get('commands')
-        if not all(isinstance(element, dict) and
-                   isinstance(element.get('command'), str) and
-                   isinstance(element.get('shell'), bool) and
-                   isinstance(element.get('require_success'), bool)
-                   for element in command_commands):
+        if not isinstance(command_commands, list) or \
+                not all(isinstance(element, dict) and
+                        (isinstance(element.get('command'), str) or
+                         (isinstance(element.get('command'), list) and
+                          element.get('command') and
+                          all(isinstance(argument, str) for argument in element.get('command')) and
+                          element.get('shell') is False)) and
+                        isinstance(element.get('shell'), bool) and
+                        isinstance(element.get('require_success'), bool)
+                        for element in command_commands):
             print('Command %s has an invalid command' % command_name)
             return False
 
+        step_ids = []
+        for element in command_commands:
+            step_requires = element.get('requires', [])
+            if not isinstance(step_requires, list) or \
+                    not all(step_id in step_ids for step_id in step_requires):
+                print('Command %s has invalid requires, only ids of earlier steps are supported'
+                      % command_name)
+                return False
+
+            step_id = element.get('id')
+            if step_id is not None:
+                if not isinstance(step_id, str) or step_id in step_ids:
+                    print('Command %s has an invalid or duplicate step id' % command_name)
+                    return False
+
+                step_ids.append(step_id)
+
         return True
 
-    def execute(self, action):
-        command = COMMANDS.get(action, {})
+    def execute(self, action, command=None):
+        if command is None:
+            command = COMMANDS.get(action, {})
 
         if not self.validate_command(action, command):
             exit(1)
 
-        self._execute(command.get('commands'))
+        if not self.run(action, command.get('commands')):
+            exit(1)
+
+    def run(self, action, commands):
+        """
+        Execute the commands and record the wall time of the shortcut and each step to History
+        :param action: name of the command
+        :type action: str
+        :param commands: list of commands(dict)
+        :type commands: list
+        :return: False if a step with require_success failed
+        :rtype: bool
+        """
+        self.timings = []
+
+        start_time = time.monotonic()
+        success = self._execute(commands)
+        self.timings.append((History.total, time.monotonic() - start_time))
+
+        try:
+            History().record(action, self.timings)
+        except OSError:
+            pass
+
+        return success
 
     @staticmethod
-    def _execute(commands):
+    def _requirements(commands):
+        """
+        Get the indexes of the steps each step has to wait for, steps without
+        'requires' wait for the previous step
+        :param commands: list of commands(dict)
+        :type commands: list
+        :return: {step index: set(step indexes)}
+        :rtype: dict
+        """
+        step_indexes = {cmd.get('id'): index for index, cmd in enumerate(commands)
+                        if cmd.get('id') is not None}
+
+        requirements = {}
+        for index, cmd in enumerate(commands):
+            if 'requires' in cmd:
+                requirements[index] = set(step_indexes[step_id] for step_id in cmd['requires'])
+            else:
+                requirements[index] = {index - 1} if index else set()
+
+        return requirements
+
+    def _execute(self, commands):
+        """
+        Execute the commands, each step starts once the steps it requires have finished
+        :param commands: list of commands(dict)
+        :type commands: list
+        :return: False if a step with require_success failed
+        :rtype: bool
+        """
+        if not any('requires' in cmd for cmd in commands):
+            return self._execute_sequential(commands)
+
+        from concurrent.futures import FIRST_COMPLETED
+        from concurrent.futures import ThreadPoolExecutor
+        from concurrent.futures import wait
+
+        pending = Executor._requirements(commands)
+        running = {}
+        finished = set()
+        failed = set()
+
+        with ThreadPoolExecutor(max_workers=max(len(commands), 1)) as pool:
+            while pending or running:
+                if pending and self.deadline is not None and time.monotonic() >= self.deadline:
+                    # out of time, let the running steps time out and don't start the rest
+                    self.timed_out = True
+                    pending.clear()
+
+                for index in sorted(pending):
+                    if pending[index] & failed:
+                        del pending[index]
+                        failed.add(index)
+
+                    elif pending[index] <= finished:
+                        del pending[index]
+                        running[pool.submit(self._execute_step, commands[index])] = index
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = running.pop(future)
+                    if not future.result() and commands[index].get('require_success'):
+                        failed.add(index)
+                    else:
+                        finished.add(index)
+
+        return not failed
+
+    def _execute_sequential(self, commands):
+        """
+        Execute the commands one after the other, stopping at the first failed step
+        with require_success
+        :param commands: list of commands(dict)
+        :type commands: list
+        :return: False if a step with require_success failed
+        :rtype: bool
+        """
         for cmd in commands:
-            command = cmd.get('command')
-            shell = bool(cmd.get('shell'))
-            require_success = bool(cmd.get('require_success'))
+            if self.deadline is not None and time.monotonic() >= self.deadline:
+                self.timed_out = True
+                break
 
-            try:
+            if not self._execute_step(cmd) and cmd.get('require_success'):
+                return False
+
+        return True
+
+    def _execute_step(self, cmd):
+        command = cmd.get('command')
+        shell = bool(cmd.get('shell'))
+
+        step = cmd.get('id') or (command if isinstance(command, str) else ' '.join(command))
+        if self.prefix:
+            if not isinstance(command, str):
+                command = ' '.join(shlex.quote(argument) for argument in command)
+            command = self.prefix + [command]
+            shell = False
+
+        elif not shell and isinstance(command, str):
+            command = shlex.split(command)
+
+        start_time = time.monotonic()
+        try:
+            if self.output is None and self.deadline is None:
                 _ = subprocess.check_call(command, shell=shell)
-            except:
+            else:
+                self._check_output(command, shell)
+        except:
+            if isinstance(sys.exc_info()[1], subprocess.TimeoutExpired):
+                self.timed_out = True
+            self.errors.append(step)
+
+            if self.output is None:
                 traceback.print_exc()
-                if require_success:
-                    exit(1)
+            else:
+                self.output(traceback.format_exc().encode('utf-8'))
+            return False
+
+        finally:
+            self.timings.append((step, time.monotonic() - start_time))
+
+        return True
+
+    def _check_output(self, command, shell):
+        """
+        Same as subprocess.check_call, passing the output to self.output as it's produced,
+        or once the process has finished when there is a deadline
+        """
+        timeout = None
+        if self.deadline is not None:
+            timeout = self.deadline - time.monotonic()
+            if timeout <= 0:
+                raise subprocess.TimeoutExpired(command, 0)
+
+        output = self.output or sys.stdout.buffer.write
+        process = subprocess.Popen(command, shell=shell, stdin=subprocess.DEVNULL,
+                                   stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                   start_new_session=timeout is not None)
+        with process:
+            if timeout is None:
+                for chunk in iter(lambda: process.stdout.read1(65536), b''):
+                    output(chunk)
+
+            else:
+                try:
+                    payload, _ = process.communicate(timeout=timeout)
+                except subprocess.TimeoutExpired:
+                    import signal
+
+                    os.killpg(process.pid, signal.SIGKILL)  # including children of the shell
+                    payload, _ = process.communicate()
+                    output(payload)
+                    raise
+
+                output(payload)
+
+        if process.returncode:
+            raise subprocess.CalledProcessError(process.returncode, command)
+
+
+class FanOut:
+
+    def __init__(self, targets, transport=None, jobs=8, timeout=None):
+        """
+        Execute a shortcut on multiple targets concurrently
+        :param targets: targets to execute the shortcut on, ie. ssh destinations
+        :type targets: list
+        :param transport: command the steps are passed to, {target} is replaced with the target
+        :type transport: list, None
+        :param jobs: maximum number of targets executing at once
+        :type jobs: int
+        :param timeout: maximum seconds per target
+        :type timeout: float, None
+        """
+        self.targets = targets
+        self.transport = TRANSPORTS['ssh'] if transport is None else transport
+        self.jobs = max(int(jobs), 1)
+        self.timeout = timeout
+
+    def execute(self, commands):
+        """
+        :param commands: list of commands(dict)
+        :type commands: list
+        :return: list of (target, status, seconds), status is one of ok, failed, timeout
+        :rtype: list
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        from concurrent.futures import as_completed
+
+        results = []
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            futures = [pool.submit(self._execute_target, target, commands)
+                       for target in self.targets]
+
+            for future in as_completed(futures):
+                target, status, seconds, payload = future.result()
+                self.print_output(target, payload)
+                results.append((target, status, seconds))
+
+        order = {target: index for index, target in enumerate(self.targets)}
+        return sorted(results, key=lambda result: order[result[0]])
+
+    def _execute_target(self, target, commands):
+        payload = []
+        start_time = time.monotonic()
+        deadline = start_time + self.timeout if self.timeout else None
+
+        executor = Executor(output=payload.append, deadline=deadline,
+                            prefix=[argument.replace('{target}', target)
+                                    for argument in self.transport])
+        success = executor._execute(commands)
+
+        status = 'ok'
+        if executor.timed_out:
+            status = 'timeout'
+        elif not success or executor.errors:
+            status = 'failed'
+
+        return target, status, time.monotonic() - start_time, b''.join(payload)
+
+    @staticmethod
+    def print_output(target, payload):
+        lines = payload.decode('utf-8', 'replace').splitlines()
+        if lines:
+            print('\n'.join('[%s] %s' % (target, line) for line in lines))
+
+    @staticmethod
+    def print_summary(results):
+        target_width = max(len('target'), *(len(result[0]) for result in results))
+        row_format = '%%-%ds  %%-7s  %%9s' % target_width
+
+        print(row_format % ('target', 'status', 'seconds'))
+        for target, status, seconds in results:
+            print(row_format % (target, status, '%.3f' % seconds))
+
+        statuses = [result[1] for result in results]
+        print('%d ok, %d failed, %d timed out' %
+              (statuses.count('ok'), statuses.count('failed'), statuses.count('timeout')))
+
+
+class Registry:
+    cache_filename = '.shortcuts-cache.json'
+    cache_version = 2
+
+    # options of shortcuts.py itself, unavailable to commands
+    reserved_arguments = {
+        '-h', '--help', '--serve', '--send', '--stats', '--tail', '-l', '--targets',
+        '--transport', '--transport-command', '--jobs', '--timeout', '--log', '--level',
+        '--addon', '--match',
+    }
+
+    def __init__(self, directory=COMMANDS_PATH):
+        """
+        COMMANDS combined with the commands from the *.json and *.toml files in directory,
+        commands from directory replace COMMANDS with the same name
+        :param directory: path of the commands directory
+        :type directory: str
+        """
+        self.directory = directory
+        self._cache = None
+
+    @property
+    def cache(self):
+        """
+        Validated commands from directory, rebuilt when a file is added, removed or modified
+        :return: {'mtimes': {filename: mtime}, 'arguments': {argument: name}, 'commands': {}}
+        :rtype: dict
+        """
+        if self._cache is not None:
+            return self._cache
+
+        mtimes = self._mtimes()
+        cache_path = os.path.join(self.directory, self.cache_filename)
+
+        if mtimes:
+            try:
+                with open(cache_path, encoding='utf-8') as open_file:
+                    cache = json.load(open_file)
+
+                if cache.get('version') == self.cache_version and \
+                        cache.get('mtimes') == mtimes and \
+                        cache.get('builtin') == self._builtin_arguments():
+                    self._cache = cache
+                    return self._cache
+            except (OSError, ValueError):
+                pass
+
+        self._cache = self._build(mtimes)
+
+        if mtimes:
+            try:
+                with open(cache_path + '.tmp', 'w', encoding='utf-8') as open_file:
+                    json.dump(self._cache, open_file)
+                os.replace(cache_path + '.tmp', cache_path)
+            except OSError:
+                pass
+
+        return self._cache
+
+    @property
+    def commands(self):
+        """
+        :return: all commands, the COMMANDS entries are not validated
+        :rtype: dict
+        """
+        commands = dict(COMMANDS)
+        commands.update(self.cache['commands'])
+        return commands
+
+    def resolve(self, argument):
+        """
+        Find the command for a single argument, without checking unrelated commands
+        :param argument: command argument, ie. --restart
+        :type argument: str
+        :return: (name, descriptor), (None, None) if no command uses argument
+        :rtype: tuple
+        """
+        name = self.cache['arguments'].get(argument)
+        if name:
+            return name, self.cache['commands'][name]
+
+        for name, descriptor in COMMANDS.items():
+            if name not in self.cache['commands'] and \
+                    argument in (descriptor.get('arguments') or []):
+                return name, descriptor
+
+        return None, None
+
+    def _mtimes(self):
+        try:
+            return {entry.name: entry.stat().st_mtime_ns for entry in os.scandir(self.directory)
+                    if entry.is_file() and entry.name.endswith(('.json', '.toml')) and
+                    entry.name != self.cache_filename}
+        except OSError:
+            return {}
+
+    @staticmethod
+    def _builtin_arguments():
+        return {name: descriptor.get('arguments') for name, descriptor in COMMANDS.items()}
+
+    def _build(self, mtimes):
+        commands = {}
+        for filename in sorted(mtimes):
+            commands.update(self._read(os.path.join(self.directory, filename)))
+
+        builtin_arguments = self._builtin_arguments()
+        cache = {'version': self.cache_version, 'mtimes': mtimes, 'builtin': builtin_arguments,
+                 'arguments': {}, 'commands': {}}
+
+        # arguments of the COMMANDS entries that aren't replaced
+        used_arguments = {argument: name for name, arguments in builtin_arguments.items()
+                          if name not in commands for argument in arguments or []}
+
+        for name, descriptor in commands.items():
+            if not Executor.validate_command(name, descriptor):
+                continue
+
+            conflicts = [argument for argument in descriptor['arguments']
+                         if argument in self.reserved_arguments or argument in used_arguments]
+            if conflicts:
+                print('Command %s has conflicting arguments %s' % (name, ', '.join(conflicts)))
+                continue
+
+            cache['commands'][name] = descriptor
+            for argument in descriptor['arguments']:
+                cache['arguments'][argument] = name
+                used_arguments[argument] = name
+
+        return cache
+
+    @staticmethod
+    def _read(filename):
+        try:
+            if filename.endswith('.toml'):
+                try:
+                    import tomllib
+                except ImportError:
+                    print('Skipping %s, reading toml requires python 3.11+' % filename)
+                    return {}
+
+                with open(filename, 'rb') as open_file:
+                    definitions = tomllib.load(open_file)
+
+            else:
+                with open(filename, encoding='utf-8') as open_file:
+                    definitions = json.load(open_file)
+
+        except (OSError, ValueError) as error:
+            print('Skipping %s, %s' % (filename, error))
+            return {}
+
+        if not isinstance(definitions, dict):
+            print('Skipping %s, commands must be an object/table' % filename)
+            return {}
+
+        return {name: descriptor for name, descriptor in definitions.items()
+                if isinstance(descriptor, dict)}
+
+
+class LogFollower:
+    chunk_size = 64 * 1024
+    interval = 0.25
+
+    levels = ['DEBUG', 'INFO', 'NOTICE', 'WARNING', 'ERROR', 'SEVERE', 'FATAL']
+
+    # Kodi 18: 2021-01-01 12:00:00.000 T:1234   ERROR: message
+    # Kodi 19: 2021-01-01 12:00:00.000 T:1234    ERROR <general>: message
+    line_pattern = re.compile(
+        br'^(?:\d{4}-\d\d-\d\d )?\d\d:\d\d:\d\d\.\d+ T:\d+\s+'
+        br'(?P<level>[A-Z]+)(?: <(?P<component>[^>]*)>)?: (?P<message>.*)$'
+    )
+
+    def __init__(self, filename=KODI_LOG, level=None, addon_id=None, pattern=None):
+        """
+        Follow a Kodi log, writing only the lines matching all of the filters
+        Lines without a log header, ie. tracebacks, belong to the previous line
+        :param filename: filename and path of the Kodi log
+        :type filename: str
+        :param level: minimum log level, ie. warning
+        :type level: str, None
+        :param addon_id: only lines mentioning this add-on id, in the component or message
+        :type addon_id: str, None
+        :param pattern: only lines matching this regular expression
+        :type pattern: str, None
+        """
+        self.filename = filename
+        self.level = self.levels.index(level.upper()) if level else 0
+        self.addon_pattern = None
+        if addon_id:
+            # a whole add-on id, plugin.video.example doesn't match plugin.video.example.extra
+            self.addon_pattern = re.compile(br'(?<![\w.-])%s(?![\w.-])'
+                                            % re.escape(addon_id.encode('utf-8')))
+        self.pattern = re.compile(pattern.encode('utf-8')) if pattern else None
+
+        self.running = False
+        self._matched = False
+
+    def parse(self, line):
+        """
+        :param line: a Kodi log line
+        :type line: bytes
+        :return: (level, component, message), None for continuation lines
+        :rtype: tuple, None
+        """
+        match = self.line_pattern.match(line)
+        if not match:
+            return None
+
+        return match.group('level'), match.group('component'), match.group('message')
+
+    def filter(self, lines):
+        """
+        :param lines: Kodi log lines
+        :type lines: list
+        :return: the lines matching the filters
+        :rtype: list
+        """
+        matched = []
+        for line in lines:
+            parsed = self.parse(line)
+            if parsed is not None:
+                level, component, message = parsed
+                # the add-on id is in the message or component, ie. <CAddonSettings[addon_id]>
+                self._matched = \
+                    (not self.level or self._level_index(level) >= self.level) and \
+                    (self.addon_pattern is None or
+                     self.addon_pattern.search(b'%s %s' % (component or b'', message))
+                     is not None) and \
+                    (self.pattern is None or self.pattern.search(line) is not None)
+
+            if self._matched:
+                matched.append(line)
+
+        return matched
+
+    def follow(self, output=None):
+        """
+        Write matching lines appended to the log to output, starting at the end of the log,
+        until stop() is called
+        :param output: binary file-like object, defaults to stdout
+        """
+        output = output or sys.stdout.buffer
+
+        open_file = open(self.filename, 'rb')
+        open_file.seek(0, os.SEEK_END)
+
+        self.running = True
+        remainder = b''
+        try:
+            while self.running:
+                chunk = open_file.read(self.chunk_size)
+                if chunk:
+                    lines = (remainder + chunk).split(b'\n')
+                    remainder = lines.pop()
+
+                    matched = self.filter(lines)
+                    if matched:
+                        output.write(b'\n'.join(matched) + b'\n')
+                        output.flush()
+                    continue
+
+                if self._rotated(open_file):
+                    open_file.close()
+                    open_file = open(self.filename, 'rb')
+                    remainder = b''
+                    continue
+
+                time.sleep(self.interval)
+        finally:
+            open_file.close()
+
+    def stop(self):
+        self.running = False
+
+    def _rotated(self, open_file):
+        try:
+            status = os.stat(self.filename)
+        except OSError:
+            return False  # rotation in progress, wait for the new log
+
+        return status.st_ino != os.fstat(open_file.fileno()).st_ino or \
+            status.st_size < open_file.tell()
+
+    def _level_index(self, level):
+        try:
+            return self.levels.index(level.decode('ascii'))
+        except ValueError:
+            return 0
+
+
+class History:
+    total = '(total)'
+
+    max_size = 256 * 1024
+    max_samples = 100
+
+    _lock = threading.Lock()
+
+    def __init__(self, filename=HISTORY_PATH):
+        """
+        Wall time history of shortcuts, stored as <action>\\t<step>\\t<seconds> lines
+        :param filename: filename and path of the history file
+        :type filename: str
+        """
+        self.filename = filename
+
+    def record(self, action, timings):
+        """
+        Append the timings of a single run, compacting the history once it grows too large
+        :param action: name of the command
+        :type action: str
+        :param timings: list of (step, seconds)
+        :type timings: list
+        """
+        payload = ''.join('%s\t%s\t%.6f\n' % (self._clean(action), self._clean(step), seconds)
+                          for step, seconds in timings)
+
+        with self._lock:
+            with open(self.filename, 'a', encoding='utf-8') as open_file:
+                open_file.write(payload)
+
+            if os.path.getsize(self.filename) > self.max_size:
+                self.compact()
+
+    def read(self):
+        """
+        :return: {(action, step): [seconds, ...]} oldest to newest
+        :rtype: dict
+        """
+        samples = {}
+        if not os.path.exists(self.filename):
+            return samples
+
+        with open(self.filename, encoding='utf-8') as open_file:
+            for line in open_file:
+                try:
+                    action, step, seconds = line.rstrip('\n').split('\t')
+                    samples.setdefault((action, step), []).append(float(seconds))
+                except ValueError:
+                    continue
+
+        return samples
+
+    def compact(self):
+        """
+        Keep only the newest max_samples of each action and step
+        """
+        samples = self.read()
+
+        temporary_filename = self.filename + '.tmp'
+        with open(temporary_filename, 'w', encoding='utf-8') as open_file:
+            for (action, step), seconds in samples.items():
+                open_file.write(''.join('%s\t%s\t%.6f\n' % (action, step, second)
+                                        for second in seconds[-self.max_samples:]))
+
+        os.replace(temporary_filename, self.filename)
+
+    def stats(self):
+        """
+        :return: list of (action, step, runs, p50, p95), the total of each action first
+        :rtype: list
+        """
+        return [(action, step, len(seconds),
+                 self.percentile(seconds, 50), self.percentile(seconds, 95))
+                for (action, step), seconds in sorted(self.read().items(),
+                                                      key=lambda item: (item[0][0],
+                                                                        item[0][1] != self.total))]
+
+    def print_stats(self):
+        rows = self.stats()
+        if not rows:
+            print('No history found at %s' % self.filename)
+            return
+
+        action_width = max(len('shortcut'), *(len(row[0]) for row in rows))
+        step_width = max(len('step'), *(len(row[1]) for row in rows))
+
+        row_format = '%%-%ds  %%-%ds  %%6s  %%9s  %%9s' % (action_width, step_width)
+        print(row_format % ('shortcut', 'step', 'runs', 'p50', 'p95'))
+        for action, step, runs, p50, p95 in rows:
+            print(row_format % (action, step, runs, '%.3fs' % p50, '%.3fs' % p95))
+
+    @staticmethod
+    def percentile(samples, percent):
+        import math
+
+        ordered = sorted(samples)
+        return ordered[max(int(math.ceil(percent / 100.0 * len(ordered))) - 1, 0)]
+
+    @staticmethod
+    def _clean(value):
+        return ' '.join(str(value).split())
 
 
 if __name__ == '__main__':
     executor = Executor()
+    registry = Registry()
+
+    if len(sys.argv) == 2:
+        # a single command argument, only resolve and check the requested command
+        resolved_name, resolved_descriptor = registry.resolve(sys.argv[1])
+        if resolved_name:
+            executor.execute(resolved_name, resolved_descriptor)
+            exit(0)
+
+    import argparse
+
+    commands = registry.commands
     parser = argparse.ArgumentParser(description='Shortcuts')
 
     parser_group = parser.add_mutually_exclusive_group(required=True)
 
-    for name, descriptor in COMMANDS.items():
+    for name, descriptor in commands.items():
         if not executor.validate_command(name, descriptor):
             continue
 
         parser_group.add_argument(*descriptor.get('arguments', []), action='store_const',
-                                  default=None, const=name, help=descriptor.get('help', ''))
+                                  dest='action', default=None, const=name,
+                                  help=descriptor.get('help', ''))
+
+    parser_group.add_argument('--serve', action='store_true',
+                              help='Run the shortcuts daemon on %s' % SOCKET_PATH)
+    parser_group.add_argument('--send', metavar='COMMAND_NAME', default=None,
+                              help='Send a command to the shortcuts daemon')
+    parser_group.add_argument('--stats', action='store_true',
+                              help='Show p50/p95 latency of each shortcut and step')
+    parser_group.add_argument('--tail', '-l', action='store_true',
+                              help='Follow the Kodi log')
+
+    parser.add_argument('--targets', nargs='+', metavar='TARGET', default=None,
+                        help='Execute the command on these targets concurrently')
+    parser.add_argument('--transport', choices=sorted(TRANSPORTS), default='ssh',
+                        help='Transport used for --targets')
+    parser.add_argument('--transport-command', metavar='COMMAND', default=None,
+                        help='Custom transport used for --targets, ie. "ssh -T {target}"')
+    parser.add_argument('--jobs', type=int, default=8,
+                        help='Maximum number of targets executing at once')
+    parser.add_argument('--timeout', type=float, default=None,
+                        help='Maximum seconds per target')
+
+    parser.add_argument('--log', default=KODI_LOG,
+                        help='Kodi log used by --tail')
+    parser.add_argument('--level', type=str.upper, choices=LogFollower.levels, default=None,
+                        help='Minimum log level used by --tail')
+    parser.add_argument('--addon', metavar='ADDON_ID', default=None,
+                        help='Only lines from this add-on for --tail')
+    parser.add_argument('--match', metavar='REGEX', default=None,
+                        help='Only lines matching this regular expression for --tail')
 
     arguments = parser.parse_args()
 
-    argument_const = next(
-        iter(const for argument, const in vars(arguments).items() if const is not None),
-        None
-    )
+    if arguments.targets and not arguments.action:
+        parser.error('--targets requires a command')
+
+    if arguments.serve:
+        from shortcuts_daemon import serve
+
+        exit(serve(SOCKET_PATH, registry.commands, Executor))
+
+    if arguments.send:
+        from shortcuts_client import send_action
+
+        exit(send_action(arguments.send, SOCKET_PATH))
 
-    if not argument_const:
+    if arguments.stats:
+        History().print_stats()
+        exit(0)
+
+    if arguments.tail:
+        follower = LogFollower(arguments.log, level=arguments.level,
+                               addon_id=arguments.addon, pattern=arguments.match)
+        try:
+            follower.follow()
+        except KeyboardInterrupt:
+            pass
+        except OSError as error:
+            print('Unable to follow %s: %s' % (arguments.log, error))
+            exit(1)
+        exit(0)
+
+    if not arguments.action:
         exit(1)
 
-    executor.execute(argument_const)
+    if arguments.targets:
+        transport = TRANSPORTS[arguments.transport]
+        if arguments.transport_command:
+            transport = shlex.split(arguments.transport_command)
+
+        fan_out = FanOut(arguments.targets, transport=transport,
+                         jobs=arguments.jobs, timeout=arguments.timeout)
+        fan_out_results = fan_out.execute(commands[arguments.action]['commands'])
+        fan_out.print_summary(fan_out_results)
+        exit(0 if all(result[1] == 'ok' for result in fan_out_results) else 1)
+
+    executor.execute(arguments.action, commands[arguments.action])
     exit(0)
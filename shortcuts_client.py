@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    This is free and unencumbered software released into the public domain.
+
+    Anyone is free to copy, modify, publish, use, compile, sell, or
+    distribute this software, either in source code form or as a compiled
+    binary, for any purpose, commercial or non-commercial, and by any
+    means.
+
+    In jurisdictions that recognize copyright laws, the author or authors
+    of this software dedicate any and all copyright interest in the
+    software to the public domain. We make this dedication for the benefit
+    of the public at large and to the detriment of our heirs and
+    successors. We intend this dedication to be an overt act of
+    relinquishment in perpetuity of all present and future rights to this
+    software under copyright law.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+    EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+    MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+    IN NO EVENT SHALL THE AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+    OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+    ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+    OTHER DEALINGS IN THE SOFTWARE.
+
+    For more information, please refer to <http://unlicense.org/>
+
+
+    Original Source: https://github.com/anxdpanic/python-modules/
+
+
+    Client for the shortcuts daemon (shortcuts.py --serve), kept separate from shortcuts.py
+    and limited to a few small standard library modules so sending a shortcut starts fast
+
+    Usage:
+        ..$ python3 shortcuts_client.py restart_kodi
+
+"""
+
+import os
+import socket
+import struct
+import sys
+
+SOCKET_PATH = os.environ.get('SHORTCUTS_SOCKET', '/tmp/shortcuts.sock')
+
+
+def send_action(action, socket_path=SOCKET_PATH):
+    """
+    Send a shortcut to the daemon and write its output to the console
+    :param action: name of the command
+    :type action: str
+    :param socket_path: filename and path of the unix socket
+    :type socket_path: str
+    :return: exit status of the shortcut
+    :rtype: int
+    """
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(socket_path)
+            client.sendall(action.encode('utf-8') + b'\n')
+
+            stream = client.makefile('rb')
+            while True:
+                header = stream.read(5)
+                if len(header) < 5:
+                    return 1
+
+                frame_type, length = struct.unpack('>cI', header)
+                payload = stream.read(length)
+
+                if frame_type == b'X':
+                    return int(payload)
+
+                sys.stdout.buffer.write(payload)
+                sys.stdout.buffer.flush()
+
+    except OSError as error:
+        print('Unable to reach the shortcuts daemon on %s: %s' % (socket_path, error))
+        return 1
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 2:
+        print('Usage: shortcuts_client.py <command name>')
+        exit(1)
+
+    exit(send_action(sys.argv[1]))
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    This is free and unencumbered software released into the public domain.
+
+    Anyone is free to copy, modify, publish, use, compile, sell, or
+    distribute this software, either in source code form or as a compiled
+    binary, for any purpose, commercial or non-commercial, and by any
+    means.
+
+    In jurisdictions that recognize copyright laws, the author or authors
+    of this software dedicate any and all copyright interest in the
+    software to the public domain. We make this dedication for the benefit
+    of the public at large and to the detriment of our heirs and
+    successors. We intend this dedication to be an overt act of
+    relinquishment in perpetuity of all present and future rights to this
+    software under copyright law.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+    EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+    MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+    IN NO EVENT SHALL THE AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+    OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+    ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+    OTHER DEALINGS IN THE SOFTWARE.
+
+    For more information, please refer to <http://unlicense.org/>
+
+
+    Original Source: https://github.com/anxdpanic/python-modules/
+
+
+    Resident shortcuts daemon (shortcuts.py --serve), executes the shortcuts sent
+    by shortcuts_client.py. Kept separate from shortcuts.py so the modules it needs
+    are only imported when serving
+
+    Usage:
+        ..$ python3 shortcuts.py --serve
+        ..$ python3 shortcuts_daemon.py
+
+"""
+
+import errno
+import os
+import signal
+import socket
+import socketserver
+import struct
+import threading
+
+
+class DaemonHandler(socketserver.StreamRequestHandler):
+    """
+        Handle a single shortcut request;
+            request: <action name>\\n
+            response: frames of <type(1 byte)><length(4 bytes)><payload>
+                      type O: output of the shortcut
+                      type X: exit status of the shortcut, always the last frame
+    """
+
+    def handle(self):
+        self._lock = threading.Lock()
+
+        action = self.rfile.readline().decode('utf-8').strip()
+        command = self.server.commands.get(action)
+
+        if not command:
+            self.write_frame(b'O', ('Command %s is invalid or unknown\n' % action).encode('utf-8'))
+            self.write_frame(b'X', b'1')
+            return
+
+        executor = self.server.executor(output=lambda chunk: self.write_frame(b'O', chunk))
+        success = executor.run(action, command.get('commands'))
+        self.write_frame(b'X', b'0' if success else b'1')
+
+    def write_frame(self, frame_type, payload):
+        with self._lock:
+            try:
+                self.wfile.write(struct.pack('>cI', frame_type, len(payload)) + payload)
+            except OSError:
+                pass  # client went away, let the shortcut finish
+
+
+class Daemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path, commands, executor):
+        """
+        Resident shortcuts server, commands are validated once on start up
+        :param socket_path: filename and path of the unix socket
+        :type socket_path: str
+        :param commands: {name: command descriptor}
+        :type commands: dict
+        :param executor: shortcuts.Executor
+        :type executor: type
+        """
+        self.executor = executor
+        self.commands = {name: descriptor for name, descriptor in commands.items()
+                         if executor.validate_command(name, descriptor)}
+
+        if os.path.exists(socket_path):
+            if Daemon.running(socket_path):
+                raise OSError(errno.EADDRINUSE, 'A shortcuts daemon is already running')
+            os.remove(socket_path)  # left behind by a daemon that didn't shut down
+
+        previous_umask = os.umask(0o177)  # socket is only accessible by the current user
+        try:
+            super().__init__(socket_path, DaemonHandler)
+        finally:
+            os.umask(previous_umask)
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+
+    @staticmethod
+    def running(socket_path):
+        """
+        :param socket_path: filename and path of the unix socket
+        :type socket_path: str
+        :return: True if a daemon accepts connections on the socket
+        :rtype: bool
+        """
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            try:
+                client.connect(socket_path)
+            except OSError:
+                return False
+        return True
+
+
+def serve(socket_path, commands, executor):
+    """
+    Run the daemon until interrupted or terminated
+    :param socket_path: filename and path of the unix socket
+    :type socket_path: str
+    :param commands: {name: command descriptor}
+    :type commands: dict
+    :param executor: shortcuts.Executor
+    :type executor: type
+    :return: exit status
+    :rtype: int
+    """
+    try:
+        daemon = Daemon(socket_path, commands, executor)
+    except OSError as error:
+        print('Unable to start the shortcuts daemon on %s: %s' % (socket_path, error))
+        return 1
+
+    with daemon:
+        # shutdown() waits for serve_forever() to return, it can't be called from its thread
+        signal.signal(signal.SIGTERM,
+                      lambda *_: threading.Thread(target=daemon.shutdown).start())
+        try:
+            daemon.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+    return 0
+
+
+if __name__ == '__main__':
+    from shortcuts import Executor
+    from shortcuts import Registry
+    from shortcuts import SOCKET_PATH
+
+    exit(serve(SOCKET_PATH, Registry().commands, Executor))
@@ -4,7 +4,8 @@
         - Saves volume before setting volume to 1
         - On consecutive run volume will be reset to saved volume
 
-    Place this file in the Kodi userdata folder (https://kodi.wiki/view/Userdata#Location)
+    Place this file and kodi_jsonrpc.py in the Kodi userdata folder
+    (https://kodi.wiki/view/Userdata#Location)
     Create a key bind in Kodi to run this script (https://kodi.wiki/view/Keymap)
 
     - Keymap action: RunScript("special://userdata/silence.py")
@@ -20,65 +21,330 @@
         </keymap>
         '''
 
+    Service:
+        Optionally, run the script as a service once per session to keep track of the volume,
+        toggling then only requires a single request and a volume changed while silenced
+        (ie. by another client) replaces the saved volume.
+
+        - Action: RunScript("special://userdata/silence.py", "service")
+        - ie. from service.autoexec or a skin's startup action
+
+    Remote:
+        Toggle one or more Kodi instances from another device over Kodi's JSON-RPC TCP socket,
+        falling back to HTTP (requires kodi_jsonrpc.py and kodi_jsonrpc_remote.py).
+        Saved volumes are kept in ~/.silence_state.json on the controlling device, a volume
+        saved by silencing in Kodi is restored as well.
+
+        ..$ python3 silence.py kodi-1 kodi-2 --username kodi --password kodi
+
 """
 
 
 import json
+import os
+import sys
+
+from kodi_jsonrpc import Client
+from kodi_jsonrpc import Request
 
-import xbmc
-import xbmcgui
+try:
+    import xbmc
+    import xbmcgui
+except ImportError:
+    xbmc = None
+    xbmcgui = None
 
-WINDOW = xbmcgui.Window(10000)
+WINDOW = xbmcgui.Window(10000) if xbmcgui else None
 WINDOW_PROPERTY = 'silence_script-volume'
+WINDOW_PROPERTY_CURRENT = 'silence_script-current'  # set by the service
+
+STATE_PATH = os.path.join(os.path.expanduser('~'), '.silence_state.json')
+
+SILENT_VOLUME = 1
+DEFAULT_VOLUME = 75
+
+GET_VOLUME = Request('Application.GetProperties', {'properties': ['volume']})
+GET_VOLUME_STATE = Request('Application.GetProperties', {'properties': ['volume', 'muted']})
+SILENCE = Request('Application.SetVolume', {'volume': SILENT_VOLUME})
+
+# volume saved by this script running in Kodi, for remote toggles
+SAVED_VOLUME_LABEL = 'Window(Home).Property(%s)' % WINDOW_PROPERTY
+GET_SAVED_VOLUME = Request('XBMC.GetInfoLabels', {'labels': [SAVED_VOLUME_LABEL]})
+
+
+class VolumeState:
+
+    def __init__(self):
+        """
+        Volume and mute state kept up to date by Application.OnVolumeChanged notifications
+        """
+        self.volume = None
+        self.muted = None
+
+    def update(self, data):
+        """
+        :param data: Application.GetProperties result or Application.OnVolumeChanged data
+        :type data: dict
+        """
+        if not isinstance(data, dict):
+            return
+
+        if data.get('volume') is not None:
+            self.volume = int(round(data['volume']))
+
+        if data.get('muted') is not None:
+            self.muted = bool(data['muted'])
+
+    def on_notification(self, method, params):
+        """
+        Notification callback for kodi_jsonrpc_remote.AsyncClient.subscribe()
+        """
+        if method == 'Application.OnVolumeChanged':
+            self.update(params.get('data'))
+
 
+class VolumeMonitor(xbmc.Monitor if xbmc else object):
 
-def json_request(payload):
-    return json.loads(xbmc.executeJSONRPC(json.dumps(payload)))
+    def __init__(self, state):
+        """
+        Keep WINDOW_PROPERTY_CURRENT in sync with the volume, and forget the saved volume
+        when the volume is changed while silenced
+        :param state: volume state to update
+        :type state: VolumeState
+        """
+        super().__init__()
+        self.state = state
+        self.publish()
 
+    def onNotification(self, sender, method, data):
+        if method != 'Application.OnVolumeChanged':
+            return
 
-def set_volume(volume):
-    request_payload = {
-        "jsonrpc": "2.0",
-        "method": "Application.SetVolume",
-        "id": 1,
-        "params": {
-            "volume": int(volume)
-        }
-    }
+        try:
+            self.state.update(json.loads(data))
+        except ValueError:
+            return
 
-    response_payload = json_request(request_payload)
+        self.publish()
+
+        if self.state.volume != SILENT_VOLUME and WINDOW.getProperty(WINDOW_PROPERTY):
+            WINDOW.clearProperty(WINDOW_PROPERTY)
+
+    def publish(self):
+        if self.state.volume is not None:
+            WINDOW.setProperty(WINDOW_PROPERTY_CURRENT, str(self.state.volume))
+
+
+def set_volume(client, volume):
+    response_payload = client.call('Application.SetVolume', {'volume': int(volume)})
     return 'error' not in response_payload
 
 
-def get_volume():
-    request_payload = {
-        "jsonrpc": "2.0",
-        "method": "Application.GetProperties",
-        "id": 1,
-        "params": {
-            "properties": ["volume"]
-        }
-    }
+def get_volume(client):
+    response_payload = client.call(GET_VOLUME)
+    return response_payload.get('result', {}).get('volume', DEFAULT_VOLUME)
 
-    response_payload = json_request(request_payload)
-    return response_payload.get('result', {}).get('volume', 75)
 
+def silence(client):
+    """
+    Get the current volume and set the volume to SILENT_VOLUME in a single round trip,
+    Kodi executes batched requests in order
+    :return: volume before silencing
+    :rtype: int
+    """
+    volume_payload, _ = client.batch([GET_VOLUME, SILENCE])
+    return volume_to_save(volume_payload.get('result', {}).get('volume', DEFAULT_VOLUME))
+
+
+def volume_to_save(volume):
+    """
+    :param volume: volume before silencing
+    :type volume: int
+    :return: volume to restore, never SILENT_VOLUME which would leave Kodi silenced
+    :rtype: int
+    """
+    volume = int(volume)
+    return DEFAULT_VOLUME if volume == SILENT_VOLUME else volume
+
+
+def toggle(client, saved_volume, current_volume=None):
+    """
+    Restore the saved volume, or silence and return the volume to save
+    :param client: Kodi JSON-RPC client
+    :type client: Client
+    :param saved_volume: saved volume, None if not silenced
+    :type saved_volume: int, None
+    :param current_volume: current volume if known, ie. from VolumeState
+    :type current_volume: int, None
+    :return: volume to save, None if the saved volume was restored
+    :rtype: int, None
+    """
+    if isinstance(saved_volume, int):
+        set_volume(client, saved_volume)
+        return None
+
+    if isinstance(current_volume, int):
+        client.call(SILENCE)
+        return volume_to_save(current_volume)
+
+    return silence(client)
+
+
+async def toggle_async(client, saved_volume, current_volume=None):
+    """
+    Same as toggle() using kodi_jsonrpc_remote.AsyncClient, without a saved volume
+    the volume saved by this script running in Kodi is restored when Kodi was silenced there
+    """
+    if isinstance(saved_volume, int):
+        await client.call('Application.SetVolume', {'volume': int(saved_volume)})
+        return None
+
+    if isinstance(current_volume, int):
+        await client.call(SILENCE)
+        return volume_to_save(current_volume)
+
+    label_payload, volume_payload, _ = \
+        await client.batch([GET_SAVED_VOLUME, GET_VOLUME, SILENCE])
 
-if __name__ == '__main__':
-    property_volume = WINDOW.getProperty(WINDOW_PROPERTY)
     try:
-        property_volume = int(property_volume)
+        saved_volume = int(label_payload.get('result', {}).get(SAVED_VOLUME_LABEL))
+    except (TypeError, ValueError):
+        saved_volume = None
+
+    if saved_volume is not None:
+        await client.call('Application.SetVolume', {'volume': saved_volume})
+        return None
+
+    return volume_to_save(volume_payload.get('result', {}).get('volume', DEFAULT_VOLUME))
+
+
+async def toggle_remote(hosts, state, **kwargs):
+    """
+    Toggle multiple Kodi instances concurrently
+    :param hosts: Kodi hosts
+    :type hosts: list
+    :param state: {host: saved volume}, updated in place
+    :type state: dict
+    :param kwargs: keyword arguments for kodi_jsonrpc_remote.connect()
+    :return: {host: exception} for hosts that failed
+    :rtype: dict
+    """
+    import asyncio
+    from kodi_jsonrpc_remote import Pool
+
+    pool = Pool(**kwargs)
+
+    async def toggle_host(host):
+        client = await pool.client(host)
+        return await toggle_async(client, state.get(host))
+
+    try:
+        results = await asyncio.gather(*(toggle_host(host) for host in hosts),
+                                       return_exceptions=True)
+    finally:
+        await pool.close()
+
+    errors = {}
+    for host, result in zip(hosts, results):
+        if isinstance(result, Exception):
+            errors[host] = result
+        elif result is None:
+            state.pop(host, None)
+        else:
+            state[host] = result
+
+    return errors
+
+
+def service(client):
+    """
+    Track the volume until Kodi exits, started with RunScript(..., "service")
+    :param client: Kodi JSON-RPC client
+    :type client: Client
+    """
+    state = VolumeState()
+    state.update(client.call(GET_VOLUME_STATE).get('result'))
+
+    monitor = VolumeMonitor(state)
+    try:
+        monitor.waitForAbort()
+    finally:
+        WINDOW.clearProperty(WINDOW_PROPERTY_CURRENT)
+
+
+def read_int_property(name):
+    try:
+        return int(WINDOW.getProperty(name))
     except ValueError:
-        property_volume = None
+        return None
+
+
+def load_state(filename=STATE_PATH):
+    try:
+        with open(filename, encoding='utf-8') as open_file:
+            return json.load(open_file)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(state, filename=STATE_PATH):
+    with open(filename, 'w', encoding='utf-8') as open_file:
+        json.dump(state, open_file)
+
+
+def main_remote():
+    import argparse
+    import asyncio
+
+    parser = argparse.ArgumentParser(description='Toggle silence on remote Kodi instances')
+    parser.add_argument('hosts', nargs='+', help='Kodi hosts')
+    parser.add_argument('--tcp-port', type=int, default=9090, help='JSON-RPC TCP port')
+    parser.add_argument('--http-port', type=int, default=8080, help='web server port')
+    parser.add_argument('--username', default=None, help='web server username')
+    parser.add_argument('--password', default=None, help='web server password')
+    parser.add_argument('--timeout', type=float, default=10, help='seconds per request')
+    arguments = parser.parse_args()
+
+    state = load_state()
+    errors = asyncio.run(toggle_remote(arguments.hosts, state,
+                                       tcp_port=arguments.tcp_port,
+                                       http_port=arguments.http_port,
+                                       username=arguments.username,
+                                       password=arguments.password,
+                                       timeout=arguments.timeout))
+    save_state(state)
+
+    for host in arguments.hosts:
+        if host in errors:
+            print('%s: failed, %s' % (host, errors[host]))
+        elif host in state:
+            print('%s: Setting volume: %s | Saved volume: %s' %
+                  (host, SILENT_VOLUME, state[host]))
+        else:
+            print('%s: Restored saved volume' % host)
+
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    if WINDOW is None:
+        exit(main_remote())
+
+    jsonrpc_client = Client()
+
+    if sys.argv[1:2] == ['service']:
+        if not WINDOW.getProperty(WINDOW_PROPERTY_CURRENT):
+            service(jsonrpc_client)
+        exit(0)
 
+    property_volume = read_int_property(WINDOW_PROPERTY)
     print('Saved volume: %s' % property_volume)
 
-    if isinstance(property_volume, int):
+    saved_volume = toggle(jsonrpc_client, property_volume,
+                          read_int_property(WINDOW_PROPERTY_CURRENT))
+    if saved_volume is None:
         print('Setting volume: %s' % property_volume)
-        set_volume(property_volume)
         WINDOW.clearProperty(WINDOW_PROPERTY)
     else:
-        current_volume = get_volume()
-        WINDOW.setProperty(WINDOW_PROPERTY, str(current_volume))
-        print('Setting volume: 1 | Saved volume: %s' % current_volume)
-        set_volume(1)
+        WINDOW.setProperty(WINDOW_PROPERTY, str(saved_volume))
+        print('Setting volume: %s | Saved volume: %s' % (SILENT_VOLUME, saved_volume))
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import kodi_gettext  # noqa: E402
+
+SOURCE = '''# Kodi Media Center language file
+msgid ""
+msgstr ""
+"Language: en_gb\\n"
+
+#. Setting label
+#: resources/settings.xml
+msgctxt "#30001"
+msgid "Volume"
+msgstr ""
+
+#. Notification
+msgctxt "#30002"
+msgid "Silenced "
+"for now"
+msgstr ""
+
+msgctxt "#30003"
+msgid "Restored"
+msgstr ""
+
+msgctxt "#30005"
+msgid "Service"
+msgstr ""
+
+'''
+
+TARGET = '''# Kodi Media Center language file
+msgid ""
+msgstr ""
+"Language: xx_xx\\n"
+
+# checked by the translation team
+#. outdated note
+msgctxt "#30001"
+msgid "Volume"
+msgstr "Volume (xx)"
+
+msgctxt "#30002"
+msgid "Silenced"
+msgstr "Silenced (xx)"
+
+msgctxt "#30004"
+msgid "Removed"
+msgstr "Removed (xx)"
+
+msgctxt "#30005"
+msgid "Service"
+msgstr ""
+
+'''
+
+MERGED = '''# Kodi Media Center language file
+msgid ""
+msgstr ""
+"Language: xx_xx\\n"
+
+# checked by the translation team
+#. Setting label
+#: resources/settings.xml
+msgctxt "#30001"
+msgid "Volume"
+msgstr "Volume (xx)"
+
+#. Notification
+#, fuzzy
+#| msgid "Silenced"
+msgctxt "#30002"
+msgid "Silenced for now"
+msgstr "Silenced (xx)"
+
+msgctxt "#30003"
+msgid "Restored"
+msgstr ""
+
+msgctxt "#30005"
+msgid "Service"
+msgstr ""
+
+'''
+
+
+class MergeTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.source = self.write(kodi_gettext.SOURCE_LANGUAGE, SOURCE)
+        self.target = self.write('resource.language.xx_xx', TARGET)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, language, payload):
+        os.makedirs(os.path.join(self.directory, language), exist_ok=True)
+        filename = os.path.join(self.directory, language, 'strings.po')
+        with open(filename, 'w', encoding='utf-8') as open_file:
+            open_file.write(payload)
+        return filename
+
+    def read(self, filename):
+        with open(filename, encoding='utf-8') as open_file:
+            return open_file.read()
+
+    def test_merge(self):
+        counts = kodi_gettext.merge(self.source, self.target)
+
+        self.assertEqual(counts, {'added': 1, 'fuzzy': 1, 'removed': 1, 'unchanged': 2})
+        self.assertEqual(self.read(self.target), MERGED)
+
+    def test_merge_merged(self):
+        kodi_gettext.merge(self.source, self.target)
+        counts = kodi_gettext.merge(self.source, self.target)
+
+        self.assertEqual(counts, {'added': 0, 'fuzzy': 0, 'removed': 0, 'unchanged': 4})
+        self.assertEqual(self.read(self.target), MERGED)
+
+    def test_merge_new_catalog(self):
+        output = os.path.join(self.directory, 'new.po')
+        counts = kodi_gettext.merge(self.source, output + '.missing', output)
+
+        self.assertEqual(counts, {'added': 4, 'fuzzy': 0, 'removed': 0, 'unchanged': 0})
+        self.assertTrue(self.read(output).startswith(SOURCE.split('\n\n')[0]))
+
+    def test_merge_tree(self):
+        results = kodi_gettext.merge_tree(self.directory, processes=1)
+
+        self.assertEqual(results, {self.target: {'added': 1, 'fuzzy': 1, 'removed': 1,
+                                                 'unchanged': 2}})
+
+    def test_merge_tree_unsorted(self):
+        self.write(kodi_gettext.SOURCE_LANGUAGE, SOURCE.replace('#30003', '#30000'))
+
+        results = kodi_gettext.merge_tree(self.directory, processes=1)
+
+        self.assertIn('msgctxt "#30000" is not in ascending order', results[self.target])
+        self.assertEqual(self.read(self.target), TARGET)
+
+
+if __name__ == '__main__':
+    unittest.main()
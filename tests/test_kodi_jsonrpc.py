@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import sys
+import unittest
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from kodi_jsonrpc import Client  # noqa: E402
+from kodi_jsonrpc import Request  # noqa: E402
+
+
+class FakeTransport:
+
+    def __init__(self, respond):
+        """
+        :param respond: callable receiving the deserialized payload, returning the response
+        """
+        self.respond = respond
+        self.payloads = []
+
+    def __call__(self, payload):
+        self.payloads.append(json.loads(payload))
+        return json.dumps(self.respond(self.payloads[-1]))
+
+
+def echo(request):
+    return {'jsonrpc': '2.0', 'id': request['id'], 'result': request['method']}
+
+
+class RequestTestCase(unittest.TestCase):
+
+    def test_serialize(self):
+        request = Request('Application.SetVolume', {'volume': 5})
+
+        self.assertEqual(json.loads(request.serialize(7)),
+                         {'jsonrpc': '2.0', 'method': 'Application.SetVolume',
+                          'params': {'volume': 5}, 'id': 7})
+        self.assertEqual(json.loads(request.serialize(8))['id'], 8)
+
+    def test_escape(self):
+        request = Request('GUI.ShowNotification', {'title': '100%', 'message': '%d %s %%'})
+
+        self.assertEqual(json.loads(request.serialize(1))['params'],
+                         {'title': '100%', 'message': '%d %s %%'})
+
+    def test_default_params(self):
+        self.assertEqual(json.loads(Request('JSONRPC.Ping').serialize(1))['params'], {})
+
+
+class ClientTestCase(unittest.TestCase):
+
+    def test_call(self):
+        transport = FakeTransport(echo)
+        client = Client(transport)
+
+        self.assertEqual(client.call('JSONRPC.Ping')['result'], 'JSONRPC.Ping')
+        self.assertEqual(client.call(Request('JSONRPC.Version'))['result'], 'JSONRPC.Version')
+        self.assertEqual([payload['id'] for payload in transport.payloads], [1, 2])
+
+    def test_batch(self):
+        # responses in reverse order, matched by id
+        transport = FakeTransport(lambda payload: [echo(request)
+                                                   for request in reversed(payload)])
+        client = Client(transport)
+
+        responses = client.batch([Request('JSONRPC.Ping'), ('JSONRPC.Version', None),
+                                  ('Application.GetProperties', {'properties': ['volume']})])
+
+        self.assertEqual(len(transport.payloads), 1)
+        self.assertEqual([response['result'] for response in responses],
+                         ['JSONRPC.Ping', 'JSONRPC.Version', 'Application.GetProperties'])
+
+    def test_match_rejected(self):
+        rejected = {'jsonrpc': '2.0', 'id': None,
+                    'error': {'code': -32600, 'message': 'Invalid request.'}}
+
+        self.assertEqual(Client.match([1, 2], rejected), [rejected, rejected])
+
+    def test_match_missing(self):
+        responses = Client.match([1, 2, 3], [{'id': 3, 'result': 3}, 'invalid',
+                                             {'id': 1, 'result': 1}])
+
+        self.assertEqual(responses[0]['result'], 1)
+        self.assertEqual(responses[1]['error']['code'], -32603)
+        self.assertEqual(responses[2]['result'], 3)
+
+    def test_transport_required(self):
+        with mock.patch('kodi_jsonrpc.xbmc', None):
+            with self.assertRaises(ValueError):
+                Client()
+
+
+if __name__ == '__main__':
+    unittest.main()
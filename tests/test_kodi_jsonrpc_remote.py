@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import base64
+import json
+import os
+import socket
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import silence  # noqa: E402
+from kodi_jsonrpc import Request  # noqa: E402
+from kodi_jsonrpc_remote import HTTPConnection  # noqa: E402
+from kodi_jsonrpc_remote import Pool  # noqa: E402
+from kodi_jsonrpc_remote import TCPConnection  # noqa: E402
+from kodi_jsonrpc_remote import connect  # noqa: E402
+
+HOST = '127.0.0.1'
+
+NOTIFICATION = {'jsonrpc': '2.0', 'method': 'Application.OnVolumeChanged',
+                'params': {'sender': 'xbmc', 'data': {'volume': 5.0, 'muted': False}}}
+
+
+class FakeKodi:
+
+    def __init__(self):
+        """
+        Stand-in for Kodi's JSON-RPC TCP socket and web server
+        """
+        self.volume = 60
+        self.labels = {}
+        self.connections = 0
+        self.authorizations = []
+        self.close_after_response = False  # web server only
+
+    def execute(self, request):
+        request_id = request.get('id')
+        method = request.get('method')
+        params = request.get('params') or {}
+
+        if method == 'Application.GetProperties':
+            result = {'volume': self.volume}
+        elif method == 'Application.SetVolume':
+            self.volume = result = params['volume']
+        elif method == 'XBMC.GetInfoLabels':
+            result = {label: self.labels.get(label, '') for label in params['labels']}
+        elif method == 'JSONRPC.Ping':
+            result = 'pong'
+        elif method.startswith('Test.'):
+            result = method
+        else:
+            return {'jsonrpc': '2.0', 'id': request_id,
+                    'error': {'code': -32601, 'message': 'Method not found.'}}
+
+        return {'jsonrpc': '2.0', 'id': request_id, 'result': result}
+
+    def respond(self, payload):
+        if isinstance(payload, list):
+            return [self.execute(request) for request in payload]
+        return self.execute(payload)
+
+    async def handle_tcp(self, reader, writer):
+        self.connections += 1
+        decoder = json.JSONDecoder()
+        buffer = ''
+        tasks = []
+
+        while True:
+            chunk = await reader.read(65536)
+            if not chunk:
+                break
+
+            buffer += chunk.decode('utf-8')
+            while buffer.strip():
+                buffer = buffer.lstrip()
+                try:
+                    payload, end = decoder.raw_decode(buffer)
+                except ValueError:
+                    break
+                buffer = buffer[end:]
+                tasks.append(asyncio.ensure_future(self.respond_tcp(writer, payload)))
+
+        for task in tasks:
+            task.cancel()
+        writer.close()
+
+    async def respond_tcp(self, writer, payload):
+        method = payload.get('method') if isinstance(payload, dict) else None
+
+        if method == 'Test.Delay':
+            await asyncio.sleep(payload['params']['seconds'])
+        elif method == 'Test.Disconnect':
+            writer.close()
+            return
+        elif method == 'Test.Notify':
+            # a notification followed by the response, without a delimiter
+            writer.write(json.dumps(NOTIFICATION).encode('utf-8'))
+
+        writer.write(json.dumps(self.respond(payload)).encode('utf-8'))
+
+    async def handle_http(self, reader, writer):
+        self.connections += 1
+
+        while await reader.readline():
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode('latin-1').strip()
+                if not line:
+                    break
+                key, _, value = line.partition(':')
+                headers[key.strip().lower()] = value.strip()
+
+            self.authorizations.append(headers.get('authorization'))
+            payload = json.loads(await reader.readexactly(int(headers['content-length'])))
+
+            body = json.dumps(self.respond(payload)).encode('utf-8')
+            writer.write(b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n'
+                         b'Content-Length: %d\r\n\r\n%s' % (len(body), body))
+            await writer.drain()
+
+            if self.close_after_response:
+                break
+
+        writer.close()
+
+
+def closed_port():
+    with socket.socket() as unused:
+        unused.bind((HOST, 0))
+        return unused.getsockname()[1]
+
+
+class RemoteTestCase(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.kodi = FakeKodi()
+        self.tcp_server = await asyncio.start_server(self.kodi.handle_tcp, HOST, 0)
+        self.http_server = await asyncio.start_server(self.kodi.handle_http, HOST, 0)
+        self.tcp_port = self.tcp_server.sockets[0].getsockname()[1]
+        self.http_port = self.http_server.sockets[0].getsockname()[1]
+        self.clients = []
+
+    async def asyncTearDown(self):
+        for client in self.clients:
+            await client.close()
+
+        for server in (self.tcp_server, self.http_server):
+            server.close()
+            await server.wait_closed()
+
+    async def connect(self, tcp=True, **kwargs):
+        client = await connect(HOST, tcp_port=self.tcp_port if tcp else closed_port(),
+                               http_port=self.http_port, timeout=5, **kwargs)
+        self.clients.append(client)
+        return client
+
+    async def test_pipelined(self):
+        client = await self.connect()
+        self.assertIsInstance(client.connection, TCPConnection)
+
+        delayed = asyncio.ensure_future(client.call('Test.Delay', {'seconds': 0.5}))
+        await asyncio.sleep(0)
+
+        self.assertEqual((await client.call('JSONRPC.Ping'))['result'], 'pong')
+        self.assertFalse(delayed.done())
+        self.assertEqual((await delayed)['result'], 'Test.Delay')
+
+    async def test_batch(self):
+        client = await self.connect()
+
+        responses = await client.batch([silence.GET_VOLUME, ('JSONRPC.Ping', None),
+                                        Request('Missing.Method')])
+
+        self.assertEqual(responses[0]['result'], {'volume': 60})
+        self.assertEqual(responses[1]['result'], 'pong')
+        self.assertEqual(responses[2]['error']['code'], -32601)
+
+    async def test_notifications(self):
+        client = await self.connect()
+        notifications = []
+        client.subscribe(lambda method, params: notifications.append((method, params)))
+
+        await client.call('Test.Notify')
+
+        self.assertEqual(notifications, [(NOTIFICATION['method'], NOTIFICATION['params'])])
+
+    async def test_reconnect(self):
+        client = await self.connect()
+
+        with self.assertRaises(ConnectionError):
+            await client.call('Test.Disconnect')
+
+        self.assertEqual((await client.call('JSONRPC.Ping'))['result'], 'pong')
+        self.assertEqual(self.kodi.connections, 2)
+
+    async def test_http_fallback(self):
+        client = await self.connect(tcp=False, username='kodi', password='secret')
+        self.assertIsInstance(client.connection, HTTPConnection)
+
+        self.assertEqual((await client.call('JSONRPC.Ping'))['result'], 'pong')
+        self.assertEqual((await client.batch([('JSONRPC.Ping', None)]))[0]['result'], 'pong')
+
+        self.assertEqual(self.kodi.connections, 1)
+        self.assertEqual(self.kodi.authorizations[0],
+                         'Basic ' + base64.b64encode(b'kodi:secret').decode('ascii'))
+
+    async def test_keep_alive_retry(self):
+        self.kodi.close_after_response = True
+        client = await self.connect(tcp=False)
+
+        self.assertEqual((await client.call('JSONRPC.Ping'))['result'], 'pong')
+        self.assertEqual((await client.call('JSONRPC.Ping'))['result'], 'pong')
+        self.assertEqual(self.kodi.connections, 2)
+
+    async def test_pool(self):
+        pool = Pool(tcp_port=self.tcp_port, http_port=self.http_port, timeout=5)
+        try:
+            self.assertIs(await pool.client(HOST), await pool.client(HOST))
+        finally:
+            await pool.close()
+
+    async def toggle(self, state):
+        errors = await silence.toggle_remote([HOST], state, tcp_port=self.tcp_port,
+                                             http_port=self.http_port, timeout=5)
+        self.assertEqual(errors, {})
+
+    async def test_toggle_remote(self):
+        state = {}
+
+        await self.toggle(state)
+        self.assertEqual(state, {HOST: 60})
+        self.assertEqual(self.kodi.volume, silence.SILENT_VOLUME)
+
+        await self.toggle(state)
+        self.assertEqual(state, {})
+        self.assertEqual(self.kodi.volume, 60)
+
+    async def test_toggle_remote_silenced_in_kodi(self):
+        self.kodi.volume = silence.SILENT_VOLUME
+        self.kodi.labels[silence.SAVED_VOLUME_LABEL] = '40'
+        state = {}
+
+        await self.toggle(state)
+        self.assertEqual(state, {})
+        self.assertEqual(self.kodi.volume, 40)
+
+    async def test_toggle_remote_silent(self):
+        self.kodi.volume = silence.SILENT_VOLUME
+        state = {}
+
+        await self.toggle(state)
+        self.assertEqual(state, {HOST: silence.DEFAULT_VOLUME})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,367 @@
+# -*- coding: utf-8 -*-
+
+import contextlib
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import shortcuts  # noqa: E402
+import shortcuts_daemon  # noqa: E402
+
+# stand-in for ssh: transport.sh <target> <command>
+TRANSPORT = '''#!/bin/sh
+target="$1"
+shift
+TARGET="$target" exec sh -c "$1"
+'''
+
+# waits up to 5 seconds for a file to exist
+WAIT_FOR = 'for i in $(seq 100); do [ -f %s ] && exit 0; sleep 0.05; done; exit 1'
+
+
+class ExecutorTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.output = []
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def step(self, command, step_id=None, requires=None, require_success=True):
+        step = {'command': command, 'shell': True, 'require_success': require_success}
+        if step_id is not None:
+            step['id'] = step_id
+        if requires is not None:
+            step['requires'] = requires
+        return step
+
+    def execute(self, commands):
+        return shortcuts.Executor(output=self.output.append)._execute(commands)
+
+    def test_sequential(self):
+        success = self.execute([self.step('touch %s' % self.path('a')),
+                                self.step('[ -f %s ]' % self.path('a')),
+                                self.step('false'),
+                                self.step('touch %s' % self.path('b'))])
+
+        self.assertFalse(success)
+        self.assertFalse(os.path.exists(self.path('b')))
+
+    def test_parallel_start(self):
+        # each step waits for the other one, only succeeds when both run at once
+        success = self.execute([
+            self.step('touch %s; %s' % (self.path('a'), WAIT_FOR % self.path('b')),
+                      step_id='a', requires=[]),
+            self.step('touch %s; %s' % (self.path('b'), WAIT_FOR % self.path('a')),
+                      step_id='b', requires=[]),
+        ])
+
+        self.assertTrue(success)
+
+    def test_requires(self):
+        success = self.execute([
+            self.step('sleep 0.3; touch %s' % self.path('slow'), step_id='slow', requires=[]),
+            self.step('true', step_id='fast', requires=[]),
+            self.step('[ -f %s ]' % self.path('slow'), requires=['slow', 'fast']),
+        ])
+
+        self.assertTrue(success)
+
+    def test_failed_requirement(self):
+        success = self.execute([
+            self.step('false', step_id='a', requires=[]),
+            self.step('touch %s' % self.path('b'), step_id='b', requires=['a']),
+            self.step('touch %s' % self.path('c'), requires=['b']),
+            self.step('touch %s' % self.path('d'), requires=[]),
+        ])
+
+        self.assertFalse(success)
+        self.assertFalse(os.path.exists(self.path('b')))
+        self.assertFalse(os.path.exists(self.path('c')))
+        self.assertTrue(os.path.exists(self.path('d')))
+
+    def test_failed_without_require_success(self):
+        success = self.execute([
+            self.step('false', step_id='a', requires=[], require_success=False),
+            self.step('touch %s' % self.path('b'), requires=['a']),
+        ])
+
+        self.assertTrue(success)
+        self.assertTrue(os.path.exists(self.path('b')))
+
+
+class FanOutTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.transport = os.path.join(self.directory, 'transport.sh')
+        with open(self.transport, 'w') as open_file:
+            open_file.write(TRANSPORT)
+        os.chmod(self.transport, 0o755)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def step(self, command, require_success=False):
+        return {'command': command, 'shell': True, 'require_success': require_success}
+
+    def fan_out(self, targets, commands, timeout=None):
+        fan_out = shortcuts.FanOut(targets, transport=[self.transport, '{target}'],
+                                   jobs=4, timeout=timeout)
+        return {target: status for target, status, _ in fan_out.execute(commands)}
+
+    def test_ok(self):
+        results = self.fan_out(['a', 'b'], [self.step('[ -n "$TARGET" ]')])
+        self.assertEqual(results, {'a': 'ok', 'b': 'ok'})
+
+    def test_failed_without_require_success(self):
+        results = self.fan_out(['a', 'bad'], [self.step('[ "$TARGET" != bad ]'),
+                                              self.step('true')])
+        self.assertEqual(results, {'a': 'ok', 'bad': 'failed'})
+
+    def test_timeout(self):
+        marker = os.path.join(self.directory, 'started')
+        start_time = time.monotonic()
+
+        results = self.fan_out(['a'], [self.step('sleep 5'), self.step('touch %s' % marker)],
+                               timeout=1)
+
+        self.assertEqual(results, {'a': 'timeout'})
+        self.assertLess(time.monotonic() - start_time, 4)
+        self.assertFalse(os.path.exists(marker))
+
+    def test_command_line(self):
+        environment = dict(os.environ,
+                           SHORTCUTS_COMMANDS=self.directory,
+                           SHORTCUTS_HISTORY=os.path.join(self.directory, 'history'))
+        process = subprocess.run([sys.executable, os.path.join(ROOT, 'shortcuts.py'), '--hdmi',
+                                  '--targets', 'a', 'b', '--transport-command', 'false {target}'],
+                                 env=environment, stdout=subprocess.PIPE,
+                                 stderr=subprocess.STDOUT)
+
+        self.assertEqual(process.returncode, 1)
+        self.assertIn(b'0 ok, 2 failed, 0 timed out', process.stdout)
+
+
+class RegistryTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, filename, commands, mtime=None):
+        path = os.path.join(self.directory, filename)
+        with open(path, 'w', encoding='utf-8') as open_file:
+            json.dump(commands, open_file)
+        if mtime is not None:
+            os.utime(path, ns=(mtime, mtime))
+
+    def command(self, *arguments):
+        return {'arguments': list(arguments), 'help': 'Test',
+                'commands': [{'command': 'true', 'shell': True, 'require_success': True}]}
+
+    def registry(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            commands = shortcuts.Registry(self.directory).commands
+        return commands, output.getvalue()
+
+    def test_cache(self):
+        self.write('a.json', {'first': self.command('--first')}, mtime=10 ** 18)
+        commands, _ = self.registry()
+        self.assertIn('first', commands)
+        self.assertTrue(os.path.exists(os.path.join(self.directory,
+                                                    shortcuts.Registry.cache_filename)))
+
+        with mock.patch.object(shortcuts.Registry, '_build', side_effect=AssertionError):
+            commands, _ = self.registry()
+        self.assertIn('first', commands)
+
+        self.write('a.json', {'second': self.command('--second')}, mtime=10 ** 18 + 1)
+        commands, _ = self.registry()
+        self.assertIn('second', commands)
+        self.assertNotIn('first', commands)
+
+    def test_conflicting_arguments(self):
+        self.write('a.json', {'reserved': self.command('--serve'),
+                              'builtin': self.command('--hdmi'),
+                              'first': self.command('--first'),
+                              'valid': self.command('--valid')})
+        self.write('b.json', {'second': self.command('--first')})
+
+        commands, output = self.registry()
+
+        self.assertEqual(set(commands) - set(shortcuts.COMMANDS), {'first', 'valid'})
+        self.assertIn('Command reserved has conflicting arguments --serve', output)
+        self.assertIn('Command builtin has conflicting arguments --hdmi', output)
+        self.assertIn('Command second has conflicting arguments --first', output)
+
+    def test_replace_builtin(self):
+        self.write('a.json', {'hdmi': self.command('--hdmi')})
+
+        commands, output = self.registry()
+
+        self.assertEqual(output, '')
+        self.assertEqual(commands['hdmi']['help'], 'Test')
+
+    def test_resolve(self):
+        self.write('a.json', {'mine': self.command('--mine')})
+        environment = dict(os.environ,
+                           SHORTCUTS_COMMANDS=self.directory,
+                           SHORTCUTS_HISTORY=os.path.join(self.directory, 'history'))
+
+        process = subprocess.run([sys.executable, '-X', 'importtime',
+                                  os.path.join(ROOT, 'shortcuts.py'), '--mine'],
+                                 env=environment, stdout=subprocess.PIPE,
+                                 stderr=subprocess.PIPE)
+
+        self.assertEqual(process.returncode, 0)
+        self.assertNotIn(b'argparse', process.stderr)
+        self.assertEqual(shortcuts.Registry(self.directory).resolve('--mine')[0], 'mine')
+        self.assertEqual(shortcuts.Registry(self.directory).resolve('--hdmi')[0], 'hdmi')
+        self.assertEqual(shortcuts.Registry(self.directory).resolve('--missing'), (None, None))
+
+
+class LogFollowerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, 'kodi.log')
+        self.write(b'10:00:00.000 T:1    ERROR <general>: plugin.video.example before\n')
+
+        self.output = io.BytesIO()
+        self.follower = shortcuts.LogFollower(self.filename, level='warning',
+                                              addon_id='plugin.video.example')
+        self.follower.interval = 0.01
+
+        self.thread = threading.Thread(target=self.follower.follow, args=(self.output,))
+        self.thread.start()
+        for _ in range(100):
+            if self.follower.running:
+                break
+            time.sleep(0.05)
+
+    def tearDown(self):
+        self.follower.stop()
+        self.thread.join()
+        shutil.rmtree(self.directory)
+
+    def write(self, payload, mode='ab'):
+        with open(self.filename, mode) as open_file:
+            open_file.write(payload)
+
+    def wait_for(self, expected):
+        for _ in range(100):
+            if self.output.getvalue() == expected:
+                break
+            time.sleep(0.05)
+        self.assertEqual(self.output.getvalue(), expected)
+
+    def test_filters(self):
+        self.write(b'10:00:01.000 T:1    ERROR <general>: plugin.video.example failed\n'
+                   b'Traceback (most recent call last):\n'
+                   b'10:00:02.000 T:1    DEBUG <general>: plugin.video.example debug\n'
+                   b'debug continuation\n'
+                   b'10:00:03.000 T:1    ERROR <general>: plugin.video.example.extra failed\n'
+                   b'10:00:04.000 T:1    ERROR <plugin.video.example>: component\n'
+                   b'10:00:05.000 T:1   WARNING: CAddonSettings[plugin.video.example]: kodi 18\n')
+
+        self.wait_for(b'10:00:01.000 T:1    ERROR <general>: plugin.video.example failed\n'
+                      b'Traceback (most recent call last):\n'
+                      b'10:00:04.000 T:1    ERROR <plugin.video.example>: component\n'
+                      b'10:00:05.000 T:1   WARNING: CAddonSettings[plugin.video.example]: kodi 18\n')
+
+    def test_partial_line(self):
+        self.write(b'10:00:01.000 T:1    ERROR <general>: plugin.video')
+        time.sleep(0.1)
+        self.write(b'.example failed\n')
+
+        self.wait_for(b'10:00:01.000 T:1    ERROR <general>: plugin.video.example failed\n')
+
+    def test_rotation(self):
+        os.rename(self.filename, self.filename + '.old')
+        self.write(b'10:00:01.000 T:1    ERROR <general>: plugin.video.example rotated\n')
+
+        self.wait_for(b'10:00:01.000 T:1    ERROR <general>: plugin.video.example rotated\n')
+
+    def test_truncation(self):
+        # shorter than the log before truncation
+        self.write(b'10:00:01.000 T:1 ERROR: plugin.video.example\n', mode='wb')
+
+        self.wait_for(b'10:00:01.000 T:1 ERROR: plugin.video.example\n')
+
+
+class DaemonTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.socket_path = os.path.join(self.directory, 'shortcuts.sock')
+        self.environment = dict(os.environ,
+                                SHORTCUTS_COMMANDS=self.directory,
+                                SHORTCUTS_SOCKET=self.socket_path,
+                                SHORTCUTS_HISTORY=os.path.join(self.directory, 'history'))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def serve(self):
+        return subprocess.Popen([sys.executable, os.path.join(ROOT, 'shortcuts.py'), '--serve'],
+                                env=self.environment, stdout=subprocess.PIPE,
+                                stderr=subprocess.STDOUT)
+
+    def wait_for_socket(self):
+        for _ in range(100):
+            if shortcuts_daemon.Daemon.running(self.socket_path):
+                return
+            time.sleep(0.05)
+        self.fail('daemon did not start')
+
+    def test_single_instance_and_sigterm(self):
+        daemon = self.serve()
+        try:
+            self.wait_for_socket()
+
+            second = self.serve()
+            output, _ = second.communicate(timeout=10)
+            self.assertEqual(second.returncode, 1)
+            self.assertIn(b'already running', output)
+            self.assertTrue(shortcuts_daemon.Daemon.running(self.socket_path))
+
+            daemon.terminate()
+            self.assertEqual(daemon.wait(timeout=10), 0)
+            self.assertFalse(os.path.exists(self.socket_path))
+        finally:
+            daemon.kill()
+            daemon.communicate()
+
+    def test_stale_socket(self):
+        with open(self.socket_path, 'w'):
+            pass
+
+        daemon = self.serve()
+        try:
+            self.wait_for_socket()
+        finally:
+            daemon.terminate()
+            daemon.communicate(timeout=10)
+
+
+if __name__ == '__main__':
+    unittest.main()
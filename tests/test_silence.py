@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import kodi_stub  # noqa: E402
+
+kodi_stub.install()
+
+import silence  # noqa: E402
+import xbmc  # noqa: E402
+from kodi_jsonrpc import Client  # noqa: E402
+
+
+class ToggleTestCase(unittest.TestCase):
+
+    def setUp(self):
+        kodi_stub.reset()
+        self.round_trips = 0
+
+        def transport(payload):
+            self.round_trips += 1
+            return xbmc.executeJSONRPC(payload)
+
+        self.client = Client(transport)
+
+    def toggle(self, saved_volume, current_volume=None):
+        self.round_trips = 0
+        saved_volume = silence.toggle(self.client, saved_volume, current_volume)
+        self.assertEqual(self.round_trips, 1)
+        return saved_volume
+
+    def test_toggle(self):
+        xbmc.application['volume'] = 60
+
+        saved_volume = self.toggle(None)
+        self.assertEqual(saved_volume, 60)
+        self.assertEqual(xbmc.application['volume'], silence.SILENT_VOLUME)
+
+        self.assertIsNone(self.toggle(saved_volume))
+        self.assertEqual(xbmc.application['volume'], 60)
+
+    def test_toggle_current_volume(self):
+        self.assertEqual(self.toggle(None, current_volume=40), 40)
+        self.assertEqual(xbmc.application['volume'], silence.SILENT_VOLUME)
+
+
+if __name__ == '__main__':
+    unittest.main()